@@ -1,12 +1,18 @@
 from __future__ import annotations
 
 import logging
-from dataclasses import dataclass
-from typing import List, Optional
-from xml.etree import ElementTree as ET
+import re
+from dataclasses import asdict, dataclass
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
 import requests
 
+from cache_utils import load_json, write_json
+from feeds import iter_channel_items
+from http_utils import get_shared_session
+
 KEYWORDS = [
     "ai",
     "artificial intelligence",
@@ -24,7 +30,43 @@ KEYWORDS = [
 ]
 
 
-@dataclass
+def _trie_pattern(keywords: Iterable[str]) -> str:
+    """Build a regex whose alternations follow a prefix trie of `keywords`.
+
+    Each branch point is tested once instead of once per keyword, giving the
+    regex engine an automaton-shaped pattern. Only existence matters, so
+    anything below a complete keyword is dropped.
+    """
+    trie: Dict[str, Any] = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def render(node: Dict[str, Any]) -> str:
+        if "" in node:
+            return ""
+        branches = [re.escape(char) + render(child) for char, child in sorted(node.items())]
+        if len(branches) == 1:
+            return branches[0]
+        return "(?:" + "|".join(branches) + ")"
+
+    return render(trie)
+
+
+# Compiled once at import: a single case-insensitive scan per article in C. The keywords
+# are ASCII, so ASCII-only case folding suffices and skips per-character Unicode folding.
+_KEYWORD_RE = re.compile(
+    _trie_pattern(keyword.lower() for keyword in KEYWORDS), re.IGNORECASE | re.ASCII
+)
+
+
+def _matches_keywords(title: str, summary: str) -> bool:
+    return _KEYWORD_RE.search(f"{title} {summary}") is not None
+
+
+@dataclass(slots=True)
 class ArsArticle:
     title: str
     link: str
@@ -42,45 +84,118 @@ class ArsTechnicaRSSClient:
         feed_url: str = "https://feeds.arstechnica.com/arstechnica/index",
         session: Optional[requests.Session] = None,
         timeout: int = 10,
+        cache_path: Optional[Path] = None,
     ):
         self.feed_url = feed_url
-        self.session = session or requests.Session()
+        self.session = session or get_shared_session()
         self.timeout = timeout
+        self.cache_path = cache_path
 
-    def fetch_articles(self, limit: int = 10) -> List[ArsArticle]:
+    def _load_cache(self, query: List[Optional[int]]) -> Dict[str, Any]:
+        cache = load_json(self.cache_path)
+        if (
+            not isinstance(cache, dict)
+            or cache.get("feed_url") != self.feed_url
+            or cache.get("query") != query
+        ):
+            return {}
+        return cache
+
+    def _save_cache(
+        self, resp: requests.Response, query: List[Optional[int]], articles: List[ArsArticle]
+    ) -> None:
+        if not self.cache_path:
+            return
+        etag = resp.headers.get("ETag")
+        last_modified = resp.headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return
+        write_json(
+            self.cache_path,
+            {
+                "feed_url": self.feed_url,
+                "etag": etag,
+                "last_modified": last_modified,
+                "query": query,
+                "articles": [asdict(article) for article in articles],
+            },
+        )
+
+    @staticmethod
+    def _conditional_headers(cache: Dict[str, Any]) -> Dict[str, str]:
+        headers: Dict[str, str] = {}
+        if cache.get("etag"):
+            headers["If-None-Match"] = cache["etag"]
+        if cache.get("last_modified"):
+            headers["If-Modified-Since"] = cache["last_modified"]
+        return headers
+
+    def _fetch(
+        self,
+        query: List[Optional[int]],
+        parse: Callable[[bytes], List[ArsArticle]],
+    ) -> List[ArsArticle]:
+        """GET the feed, reusing the cached result of the same query on 304 Not Modified."""
         logging.debug("Fetching Ars Technica RSS from %s", self.feed_url)
-        resp = self.session.get(self.feed_url, timeout=self.timeout)
+        cache = self._load_cache(query)
+        headers = self._conditional_headers(cache)
+        resp = self.session.get(self.feed_url, headers=headers, timeout=self.timeout)
+        if resp.status_code == 304 and headers:
+            logging.info("Ars Technica feed not modified; reusing cached articles.")
+            return [ArsArticle(**article) for article in cache.get("articles", [])]
         resp.raise_for_status()
-        root = ET.fromstring(resp.content)
-        channel = root.find("channel")
-        if channel is None:
-            raise ValueError("Invalid RSS feed: missing channel element")
-
-        articles: List[ArsArticle] = []
-        for item in channel.findall("item"):
-            title = (item.findtext("title") or "").strip()
-            description = (item.findtext("description") or "").strip()
-            link = (item.findtext("link") or "").strip()
-            if not title or not description:
-                continue
-            articles.append(ArsArticle(title=title, link=link, summary=description))
-            if len(articles) >= limit:
-                break
+        articles = parse(resp.content)
+        self._save_cache(resp, query, articles)
         return articles
 
+    @staticmethod
+    def _iter_items(content: bytes) -> Iterator[Tuple[str, str, str]]:
+        """Stream (title, description, link) for complete items, in feed order."""
+        for elem in iter_channel_items(content):
+            title = (elem.findtext("title") or "").strip()
+            description = (elem.findtext("description") or "").strip()
+            link = (elem.findtext("link") or "").strip()
+            if title and description:
+                yield title, description, link
+
+    def fetch_articles(self, limit: int = 10) -> List[ArsArticle]:
+        def parse(content: bytes) -> List[ArsArticle]:
+            return [
+                ArsArticle(title=title, link=link, summary=description)
+                for title, description, link in islice(self._iter_items(content), limit)
+            ]
+
+        return self._fetch([limit, None], parse)
+
     def _is_relevant(self, article: ArsArticle) -> bool:
-        haystack = f"{article.title} {article.summary}".lower()
-        return any(keyword in haystack for keyword in KEYWORDS)
+        return _matches_keywords(article.title, article.summary)
 
     def fetch_relevant_articles(self, limit: int = 10, desired: int = 4) -> List[ArsArticle]:
-        articles = self.fetch_articles(limit=limit)
-        relevant = [article for article in articles if self._is_relevant(article)]
-        if not relevant:
-            logging.warning(
-                "No Ars Technica articles matched AI/programming keywords; falling back to latest items."
-            )
-            relevant = articles
-        return relevant[:desired]
+        """Return up to `desired` relevant articles among the first `limit` feed items.
+
+        Filtering happens while the feed is streamed, so parsing stops as soon as
+        enough relevant items are found and rejected items are never materialized
+        beyond the `desired` needed for the fallback.
+        """
+
+        def parse(content: bytes) -> List[ArsArticle]:
+            relevant: List[ArsArticle] = []
+            fallback: List[ArsArticle] = []
+            for title, description, link in islice(self._iter_items(content), limit):
+                if _matches_keywords(title, description):
+                    relevant.append(ArsArticle(title=title, link=link, summary=description))
+                    if len(relevant) >= desired:
+                        break
+                elif len(fallback) < desired:
+                    fallback.append(ArsArticle(title=title, link=link, summary=description))
+            if not relevant:
+                logging.warning(
+                    "No Ars Technica articles matched AI/programming keywords; falling back to latest items."
+                )
+                return fallback
+            return relevant
+
+        return self._fetch([limit, desired], parse)
 
     def build_prompt(self, articles: List[ArsArticle]) -> str:
         if not articles:
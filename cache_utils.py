@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import json
+import logging
+from pathlib import Path
+from typing import Any, Optional
+
+
+def load_json(path: Optional[Path]) -> Any:
+    """Return the JSON stored at `path`, or None when it is missing or unreadable."""
+    if not path or not path.exists():
+        return None
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as exc:
+        logging.debug("Ignoring unreadable cache file %s: %s", path, exc)
+        return None
+
+
+def write_json(path: Path, data: Any) -> None:
+    """Atomically replace `path` with `data`; failures are logged, never raised."""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        tmp_path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+        tmp_path.replace(path)
+    except OSError as exc:
+        logging.warning("Failed to write cache file %s: %s", path, exc)
@@ -1,21 +1,29 @@
 from __future__ import annotations
 
+import argparse
 import json
 import logging
 import random
+from dataclasses import dataclass
 from datetime import datetime
+from functools import partial
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
 
 from ars_client import ArsTechnicaRSSClient
+from feeds import fetch_many
+from http_utils import get_shared_session
 from lark_client import LarkClient
+from llm_cache import clear_cache
 from llm_utils import (
     LLMClient,
     generate_backend_architect_coaching,
     generate_english_learning,
     generate_japanese_learning,
 )
-from netflix_client import NetflixTechBlogRSSClient
+from netflix_client import NetflixTechBlogItem, NetflixTechBlogRSSClient
 from rss_client import JapaneseNewsItem, JapaneseRSSClient
 
 
@@ -42,6 +50,62 @@ def _as_bool(value: Any, default: bool = False) -> bool:
     return default
 
 
+@dataclass(frozen=True, slots=True)
+class RunConfig:
+    """Typed view of config.json, resolved once at the start of a run."""
+
+    openai_api_key: str
+    openai_model: str
+    lark_app_id: Optional[str]
+    lark_app_secret: Optional[str]
+    lark_folder_token: str
+    english_rss_url: str
+    max_english: int
+    japanese_rss_url: str
+    netflix_rss_url: str
+    netflix_fallback_urls: Tuple[str, ...]
+    netflix_max_chars: int
+    netflix_ca_bundle: Optional[str]
+    netflix_verify_ssl: bool
+    netflix_allow_insecure_fallback: bool
+    netflix_allow_curl_fallback: bool
+    timeout: int
+    cache_dir: Path
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "RunConfig":
+        return cls(
+            openai_api_key=config["openai_api_key"],
+            openai_model=config.get("openai_model", "gpt-4o-mini"),
+            lark_app_id=config.get("lark_app_id"),
+            lark_app_secret=config.get("lark_app_secret"),
+            lark_folder_token=config["lark_folder_token"],
+            english_rss_url=config.get(
+                "english_rss_url", "https://feeds.arstechnica.com/arstechnica/index"
+            ),
+            max_english=config.get("max_english_items", 4),
+            japanese_rss_url=config["japanese_rss_url"],
+            netflix_rss_url=config.get("netflix_rss_url", "https://netflixtechblog.com/feed"),
+            netflix_fallback_urls=tuple(
+                config.get("netflix_rss_fallback_urls")
+                or ["https://medium.com/feed/netflix-techblog"]
+            ),
+            netflix_max_chars=int(config.get("netflix_max_chars", 12000)),
+            netflix_ca_bundle=config.get("netflix_ca_bundle") or None,
+            netflix_verify_ssl=_as_bool(config.get("netflix_verify_ssl"), True),
+            netflix_allow_insecure_fallback=_as_bool(
+                config.get("netflix_allow_insecure_fallback"), False
+            ),
+            netflix_allow_curl_fallback=_as_bool(
+                config.get("netflix_allow_curl_fallback"), True
+            ),
+            timeout=config.get("request_timeout", 15),
+            cache_dir=Path(
+                config.get("cache_dir") or Path.home() / ".cache" / "daily_task"
+            ).expanduser(),
+        )
+
+
 def build_english_section(data: Dict[str, str]) -> Dict[str, str]:
     summary_en = data.get("summary_en", "").strip()
     summary_zh = data.get("summary_zh", "").strip()
@@ -51,37 +115,37 @@ def build_english_section(data: Dict[str, str]) -> Dict[str, str]:
     }
 
 
+def _format_news_line(item: JapaneseNewsItem, romaji_part: str) -> str:
+    link_part = f"[原文链接]({item.link})" if item.link else ""
+    return f"- **{item.title}**\n  {item.content}{romaji_part}\n  {link_part}".strip()
+
+
+def _format_vocab_line(entry: Dict[str, str]) -> str:
+    word = entry.get("word", "")
+    romaji_word = entry.get("romaji", "").strip()
+    display_word = f"{word} ({romaji_word})" if romaji_word else word
+    return f"- **{display_word}** ({entry.get('part_of_speech', '')}): {entry.get('meaning_zh', '')}"
+
+
 def build_japanese_section(
     news_items: List[JapaneseNewsItem], data: Dict[str, str]
 ) -> Dict[str, str]:
-    news_lines = []
     romaji = data.get("news_romaji", "").strip()
-    for item in news_items:
-        link_part = f"[原文链接]({item.link})" if item.link else ""
-        romaji_part = f"\n  ローマ音: {romaji}" if romaji else ""
-        news_lines.append(
-            f"- **{item.title}**\n  {item.content}{romaji_part}\n  {link_part}".strip()
-        )
-    news_text = "\n\n".join(news_lines) if news_lines else "暂无新闻抓取。"
+    romaji_part = f"\n  ローマ音: {romaji}" if romaji else ""
+    news_text = "\n\n".join(
+        _format_news_line(item, romaji_part) for item in news_items
+    ) or "暂无新闻抓取。"
 
     translation = data.get("translation", "").strip()
 
-    vocab_lines = []
-    for entry in data.get("vocabulary", []):
-        word = entry.get("word", "")
-        romaji_word = entry.get("romaji", "").strip()
-        display_word = f"{word} ({romaji_word})" if romaji_word else word
-        pos = entry.get("part_of_speech", "")
-        meaning = entry.get("meaning_zh", "")
-        vocab_lines.append(f"- **{display_word}** ({pos}): {meaning}")
-    vocab_text = "\n".join(vocab_lines) if vocab_lines else "暂无词汇整理。"
-
-    grammar_lines = []
-    for entry in data.get("grammar", []):
-        title = entry.get("title", "")
-        desc = entry.get("description", "")
-        grammar_lines.append(f"- **{title}**: {desc}")
-    grammar_text = "\n".join(grammar_lines) if grammar_lines else "暂无语法说明。"
+    vocab_text = "\n".join(
+        map(_format_vocab_line, data.get("vocabulary") or ())
+    ) or "暂无词汇整理。"
+
+    grammar_text = "\n".join(
+        f"- **{entry.get('title', '')}**: {entry.get('description', '')}"
+        for entry in data.get("grammar") or ()
+    ) or "暂无语法说明。"
 
     return {
         "news": news_text,
@@ -162,72 +226,116 @@ def compose_markdown(
 """.strip()
 
 
-def main() -> None:
-    logging.basicConfig(
-        level=logging.INFO, format="[%(asctime)s] %(levelname)s - %(message)s"
-    )
-    project_root = Path(__file__).resolve().parent
-    config = load_config(project_root / "config.json")
-    timeout = config.get("request_timeout", 15)
-
-    logging.info("Starting daily language learning task")
-
-    ars_client = ArsTechnicaRSSClient(
-        feed_url=config.get("english_rss_url", "https://feeds.arstechnica.com/arstechnica/index"),
-        timeout=timeout,
-    )
-    max_english = config.get("max_english_items", 4)
+def _run_english_chain(
+    ars_client: ArsTechnicaRSSClient, llm_client: LLMClient, max_english: int
+) -> Dict[str, Any]:
     english_items = ars_client.fetch_relevant_articles(limit=10, desired=max_english)
     if not english_items:
         raise RuntimeError("Unable to fetch Ars Technica articles.")
-    english_prompt = ars_client.build_prompt(english_items)
+    return generate_english_learning(llm_client, ars_client.build_prompt(english_items))
 
-    rss_client = JapaneseRSSClient(
-        feed_url=config["japanese_rss_url"], timeout=timeout
-    )
+
+def _run_japanese_chain(
+    rss_client: JapaneseRSSClient, llm_client: LLMClient
+) -> Tuple[JapaneseNewsItem, Dict[str, Any]]:
     japanese_candidates = rss_client.fetch_items(limit=5)
     if not japanese_candidates:
         raise RuntimeError("Unable to fetch Japanese RSS news.")
     selected_item = random.choice(japanese_candidates)
     logging.info("Selected Japanese article for study: %s", selected_item.title)
     japanese_prompt = rss_client.build_prompt([selected_item])
+    return selected_item, generate_japanese_learning(llm_client, japanese_prompt)
 
-    llm_client = LLMClient(
-        api_key=config["openai_api_key"],
-        model=config.get("openai_model", "gpt-4o-mini"),
-    )
-    logging.info("Generating English learning content via OpenAI")
-    english_data = generate_english_learning(llm_client, english_prompt)
-
-    netflix_client = NetflixTechBlogRSSClient(
-        feed_url=config.get("netflix_rss_url", "https://netflixtechblog.com/feed"),
-        fallback_feed_urls=(
-            config.get("netflix_rss_fallback_urls")
-            or ["https://medium.com/feed/netflix-techblog"]
-        ),
-        timeout=timeout,
-        max_chars=int(config.get("netflix_max_chars", 12000)),
-        ca_bundle=(config.get("netflix_ca_bundle") or None),
-        verify=_as_bool(config.get("netflix_verify_ssl"), True),
-        allow_insecure_fallback=_as_bool(
-            config.get("netflix_allow_insecure_fallback"), False
-        ),
-        allow_curl_fallback=_as_bool(config.get("netflix_allow_curl_fallback"), True),
-    )
+
+def _run_backend_chain(
+    netflix_client: NetflixTechBlogRSSClient, llm_client: LLMClient
+) -> Tuple[NetflixTechBlogItem, Dict[str, Any]]:
     netflix_items = netflix_client.fetch_latest(limit=1)
     if not netflix_items:
         raise RuntimeError("Unable to fetch Netflix Tech Blog article.")
     latest_netflix = netflix_items[0]
-    logging.info("Generating backend coaching content via OpenAI")
     backend_data = generate_backend_architect_coaching(
         llm_client,
         article_title=latest_netflix.title,
         article_url=latest_netflix.link,
         article_text=latest_netflix.content,
     )
+    return latest_netflix, backend_data
+
+
+def build_netflix_client(
+    cfg: RunConfig, session: requests.Session
+) -> NetflixTechBlogRSSClient:
+    # A custom CA bundle needs the client's own SSLContext session; the shared
+    # session would send it as verify=<path> and reload the bundle per request.
+    return NetflixTechBlogRSSClient(
+        feed_url=cfg.netflix_rss_url,
+        fallback_feed_urls=list(cfg.netflix_fallback_urls),
+        session=None if cfg.netflix_ca_bundle else session,
+        timeout=cfg.timeout,
+        max_chars=cfg.netflix_max_chars,
+        ca_bundle=cfg.netflix_ca_bundle,
+        verify=cfg.netflix_verify_ssl,
+        allow_insecure_fallback=cfg.netflix_allow_insecure_fallback,
+        allow_curl_fallback=cfg.netflix_allow_curl_fallback,
+    )
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Generate and publish the daily language notes.")
+    parser.add_argument(
+        "--clean-cache",
+        action="store_true",
+        help="discard cached LLM responses and Lark document tokens before running",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    logging.basicConfig(
+        level=logging.INFO, format="[%(asctime)s] %(levelname)s - %(message)s"
+    )
+    project_root = Path(__file__).resolve().parent
+    cfg = RunConfig.from_config(load_config(project_root / "config.json"))
+    now = datetime.now()
+    llm_cache_dir = cfg.cache_dir / "llm"
+    lark_cache_path = cfg.cache_dir / "lark_docs.json"
+    if args.clean_cache:
+        clear_cache(llm_cache_dir)
+        if lark_cache_path.exists():
+            lark_cache_path.unlink()
+            logging.info("Removed Lark document cache %s", lark_cache_path)
+
+    logging.info("Starting daily language learning task")
+    # One keep-alive pool for every feed fetch so repeated hosts skip the TLS handshake.
+    session = get_shared_session()
 
-    logging.info("Generating Japanese learning content via OpenAI")
-    japanese_data = generate_japanese_learning(llm_client, japanese_prompt)
+    ars_client = ArsTechnicaRSSClient(
+        feed_url=cfg.english_rss_url,
+        session=session,
+        timeout=cfg.timeout,
+        cache_path=cfg.cache_dir / "ars_feed.json",
+    )
+    rss_client = JapaneseRSSClient(
+        feed_url=cfg.japanese_rss_url, session=session, timeout=cfg.timeout
+    )
+    netflix_client = build_netflix_client(cfg, session)
+    llm_client = LLMClient(
+        api_key=cfg.openai_api_key,
+        model=cfg.openai_model,
+        cache_dir=llm_cache_dir,
+    )
+    # Each chain fetches its feed and immediately generates from it, so one slow feed
+    # never holds back the LLM calls of the others.
+    logging.info("Generating English, backend coaching and Japanese content via OpenAI")
+    english_data, (selected_item, japanese_data), (latest_netflix, backend_data) = fetch_many(
+        [
+            partial(_run_english_chain, ars_client, llm_client, cfg.max_english),
+            partial(_run_japanese_chain, rss_client, llm_client),
+            partial(_run_backend_chain, netflix_client, llm_client),
+        ]
+    )
 
     english_section = build_english_section(english_data)
     backend_section = build_backend_section(
@@ -235,24 +343,22 @@ def main() -> None:
     )
     japanese_sections = build_japanese_section([selected_item], japanese_data)
 
-    today = datetime.now().strftime("%Y-%m-%d")
+    today = now.strftime("%Y-%m-%d")
     new_entry = compose_markdown(today, english_section, backend_section, japanese_sections)
 
-    month_title = datetime.now().strftime("Daily Language Learning %Y-%m")
-    app_id = config.get("lark_app_id")
-    app_secret = config.get("lark_app_secret")
-    if not app_id or not app_secret:
+    month_title = now.strftime("Daily Language Learning %Y-%m")
+    if not cfg.lark_app_id or not cfg.lark_app_secret:
         raise ValueError(
             "Missing Lark credentials. Provide lark_app_id and lark_app_secret in config.json."
         )
     lark_client = LarkClient(
-        app_id=app_id,
-        app_secret=app_secret,
-        root_folder_token=config["lark_folder_token"],
-        timeout=timeout,
+        app_id=cfg.lark_app_id,
+        app_secret=cfg.lark_app_secret,
+        root_folder_token=cfg.lark_folder_token,
+        timeout=cfg.timeout,
+        cache_path=lark_cache_path,
     )
-    document_token = lark_client.ensure_document(month_title)
-    lark_client.prepend_content(document_token, new_entry)
+    lark_client.prepend_to_document(month_title, new_entry)
 
     logging.info("Daily content appended to document '%s'", month_title)
 
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import codecs
+import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from io import BytesIO
+from typing import Callable, Iterator, List, Optional, Sequence, TypeVar
+from xml.etree import ElementTree as ET
+
+T = TypeVar("T")
+
+MAX_FETCH_WORKERS = 8
+PUBDATE_CACHE_SIZE = 1024
+
+_XML_DECL_ENCODING_RE = re.compile(rb"""<\?xml[^>]*?\sencoding\s*=\s*["']([A-Za-z0-9._-]+)["']""")
+# expat's built-in decoders, by Python codec name. pyexpat also handles any single-byte
+# codec (cp1252, iso8859-15, koi8-r, ...) itself; only multi-byte ones need transcoding.
+_EXPAT_BUILTIN_CODECS = frozenset({"utf-8", "utf-16", "utf-16-le", "utf-16-be", "ascii", "iso8859-1"})
+_ALL_BYTES = bytes(range(256))
+
+
+def fetch_many(jobs: Sequence[Callable[[], T]], max_workers: int = MAX_FETCH_WORKERS) -> List[T]:
+    """Run independent, network-bound jobs concurrently; results keep the input order.
+
+    The first failing job, in input order, re-raises once every job has finished.
+    """
+    if not jobs:
+        return []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(jobs))) as executor:
+        futures = [executor.submit(job) for job in jobs]
+        return [future.result() for future in futures]
+
+
+def iter_channel_items(content: bytes) -> Iterator[ET.Element]:
+    """Stream each parsed <item> in feed order, clearing it once the caller moves on.
+
+    Raises ValueError when the feed has no <channel> or an item sits outside one. The
+    channel is noted at its start tag, so callers that stop early are still checked.
+    """
+    has_channel = False
+    for event, elem in ET.iterparse(BytesIO(content), events=("start", "end")):
+        if event == "start":
+            if elem.tag == "channel":
+                has_channel = True
+            continue
+        if elem.tag != "item":
+            continue
+        if not has_channel:
+            break
+        yield elem
+        elem.clear()
+    if not has_channel:
+        raise ValueError("Invalid RSS feed: missing channel element")
+
+
+@lru_cache(maxsize=None)
+def _needs_transcoding(encoding: str) -> bool:
+    """Whether expat would reject `encoding`: the test pyexpat itself applies."""
+    try:
+        name = codecs.lookup(encoding).name
+    except LookupError:
+        return False  # Python cannot decode it either; let the parser report it.
+    if name in _EXPAT_BUILTIN_CODECS:
+        return False
+    # pyexpat maps each byte to one character and refuses codecs where that fails.
+    return len(_ALL_BYTES.decode(name, "replace")) != 256
+
+
+def to_expat_bytes(content: bytes) -> bytes:
+    """Return feed bytes that expat can parse, transcoding to UTF-8 only when needed.
+
+    expat rejects multi-byte encodings such as Shift_JIS and EUC-JP outright, so such
+    feeds are decoded once with the declared codec. UTF-8 and single-byte feeds pass
+    through untouched.
+    """
+    match = _XML_DECL_ENCODING_RE.match(content)
+    if not match:
+        return content
+    encoding = match.group(1).decode("ascii")
+    if not _needs_transcoding(encoding):
+        return content
+    start, end = match.span(1)
+    try:
+        body = content[end:].decode(encoding)
+    except UnicodeDecodeError:
+        return content
+    # The declaration itself is ASCII in every codec that can declare itself.
+    return content[:start] + b"utf-8" + body.encode("utf-8")
+
+
+@lru_cache(maxsize=PUBDATE_CACHE_SIZE)
+def _parse_rfc2822(value: str) -> datetime:
+    # Raises on bad input, and lru_cache never stores exceptions, so only successes are kept.
+    dt = parsedate_to_datetime(value)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt
+
+
+def parse_pubdate(value: Optional[str], default: Optional[datetime] = None) -> datetime:
+    """Parse an RSS pubDate, falling back to `default` (or now, UTC) when missing or invalid.
+
+    Parsed values are memoized: feeds repeat the same pubDate strings across polls,
+    and datetimes are immutable, so sharing them between callers is safe.
+    """
+    if value:
+        try:
+            return _parse_rfc2822(value)
+        except (TypeError, ValueError):
+            logging.debug("Unable to parse pubDate '%s'", value)
+    return default if default is not None else datetime.now(timezone.utc)
@@ -2,16 +2,21 @@ from __future__ import annotations
 
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import List, Optional
 
 import requests
 
+import json_utils
+from http_utils import get_shared_session
+
 HN_TOP_STORIES_URL = "https://hacker-news.firebaseio.com/v0/topstories.json"
 HN_ITEM_URL = "https://hacker-news.firebaseio.com/v0/item/{story_id}.json"
+HN_ALGOLIA_FRONT_PAGE_URL = "https://hn.algolia.com/api/v1/search"
 
 
-@dataclass
+@dataclass(slots=True)
 class HackerNewsStory:
     """Represents a Hacker News story that can be used for prompting."""
 
@@ -29,15 +34,21 @@ class HackerNewsStory:
 class HackerNewsClient:
     """Simple Hacker News API client that fetches top technology stories."""
 
-    def __init__(self, session: Optional[requests.Session] = None, timeout: int = 10):
-        self.session = session or requests.Session()
+    def __init__(
+        self,
+        session: Optional[requests.Session] = None,
+        timeout: int = 10,
+        max_workers: int = 8,
+    ):
+        self.session = session or get_shared_session()
         self.timeout = timeout
+        self.max_workers = max_workers
 
     def fetch_top_story_ids(self, limit: int = 30) -> List[int]:
         logging.debug("Fetching top story IDs from Hacker News")
         resp = self.session.get(HN_TOP_STORIES_URL, timeout=self.timeout)
         resp.raise_for_status()
-        data = resp.json()
+        data = json_utils.loads(resp.content)
         if not isinstance(data, list):
             raise ValueError(f"Unexpected response from HN API: {json.dumps(data)[:200]}")
         return data[:limit]
@@ -48,8 +59,8 @@ class HackerNewsClient:
                 HN_ITEM_URL.format(story_id=story_id), timeout=self.timeout
             )
             resp.raise_for_status()
-            payload = resp.json()
-        except requests.RequestException as exc:
+            payload = json_utils.loads(resp.content)
+        except (requests.RequestException, ValueError) as exc:
             logging.warning("Failed to fetch story %s: %s", story_id, exc)
             return None
 
@@ -66,11 +77,58 @@ class HackerNewsClient:
 
     def fetch_top_stories(self, desired: int = 4) -> List[HackerNewsStory]:
         """Fetch up to `desired` stories, skipping invalid ones."""
+        story_ids = self.fetch_top_story_ids(limit=40)
         stories: List[HackerNewsStory] = []
-        for story_id in self.fetch_top_story_ids(limit=40):
-            story = self.fetch_story(story_id)
-            if story:
-                stories.append(story)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [executor.submit(self.fetch_story, story_id) for story_id in story_ids]
+            # Consume in ranking order; stories still queued are cancelled once enough arrive.
+            for future in futures:
+                story = future.result()
+                if story:
+                    stories.append(story)
+                if len(stories) >= desired:
+                    for pending in futures:
+                        pending.cancel()
+                    break
+        return stories
+
+    def fetch_top_stories_batched(self, desired: int = 4) -> List[HackerNewsStory]:
+        """Fetch front-page stories with a single Algolia search call.
+
+        Falls back to the per-item Firebase API when the search call fails.
+        """
+        try:
+            resp = self.session.get(
+                HN_ALGOLIA_FRONT_PAGE_URL,
+                params={"tags": "front_page", "hitsPerPage": max(desired, 30)},
+                timeout=self.timeout,
+            )
+            resp.raise_for_status()
+            payload = json_utils.loads(resp.content)
+            hits = payload.get("hits") if isinstance(payload, dict) else None
+            if not isinstance(hits, list):
+                raise ValueError(f"Unexpected response from Algolia HN API: {json.dumps(payload)[:200]}")
+        except (requests.RequestException, ValueError) as exc:
+            logging.warning("Algolia HN search failed; falling back to Firebase API: %s", exc)
+            return self.fetch_top_stories(desired=desired)
+
+        stories: List[HackerNewsStory] = []
+        for hit in hits:
+            if not isinstance(hit, dict):
+                continue
+            title = hit.get("title")
+            object_id = hit.get("objectID")
+            if not title or not object_id:
+                continue
+            try:
+                story_id = int(object_id)
+            except ValueError:
+                continue
+            stories.append(
+                HackerNewsStory(
+                    id=story_id, title=title, url=hit.get("url"), text=hit.get("story_text")
+                )
+            )
             if len(stories) >= desired:
                 break
         return stories
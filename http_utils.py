@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import ssl
+import threading
+from typing import Any, Collection, Dict, Optional, Tuple, Union
+
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+_shared_session: Optional[requests.Session] = None
+_shared_session_lock = threading.Lock()
+_system_trust_pool: Optional[urllib3.PoolManager] = None
+_system_trust_pool_lock = threading.Lock()
+
+
+class SSLContextAdapter(HTTPAdapter):
+    """HTTPAdapter that verifies TLS with one prebuilt SSLContext.
+
+    With `verify=<path>` every new connection loads the CA file from disk again; a
+    context built once keeps the parsed store. Any verifying request, whatever CA path
+    it names, uses the context; `verify=False` keeps requests' own handling.
+    """
+
+    def __init__(self, ssl_context: ssl.SSLContext, **kwargs: Any):
+        # Before requests 2.32.3 the override below is never called, so the context
+        # would silently not apply while cert_verify still drops the CA path.
+        if not hasattr(HTTPAdapter, "build_connection_pool_key_attributes"):
+            raise RuntimeError("SSLContextAdapter requires requests>=2.32.3")
+        self.ssl_context = ssl_context
+        super().__init__(**kwargs)
+
+    def build_connection_pool_key_attributes(
+        self, request: requests.PreparedRequest, verify: Union[bool, str], cert: Any = None
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        host_params, pool_kwargs = super().build_connection_pool_key_attributes(
+            request, verify, cert
+        )
+        if verify:
+            # Session.merge_environment_settings may have swapped True for REQUESTS_CA_BUNDLE.
+            pool_kwargs.pop("ca_certs", None)
+            pool_kwargs.pop("ca_cert_dir", None)
+            pool_kwargs["ssl_context"] = self.ssl_context
+        return host_params, pool_kwargs
+
+    def cert_verify(self, conn: Any, url: str, verify: Union[bool, str], cert: Any) -> None:
+        super().cert_verify(conn, url, verify, cert)
+        if verify:
+            # requests points verified pools at a CA file, which urllib3 would load
+            # into the shared context on every new connection.
+            conn.ca_certs = None
+            conn.ca_cert_dir = None
+
+
+def create_session(
+    *,
+    pool_connections: int = 16,
+    pool_maxsize: int = 32,
+    total_retries: int = 3,
+    read_retries: Optional[int] = None,
+    backoff_factor: float = 0.2,
+    status_forcelist: Collection[int] = RETRY_STATUS_CODES,
+    allowed_methods: Optional[Collection[str]] = None,
+    ssl_context: Optional[ssl.SSLContext] = None,
+) -> requests.Session:
+    """Build a keep-alive session with a pooled, retrying adapter for http and https.
+
+    Pass `ssl_context` to verify https with that context instead of certifi's bundle;
+    this raises RuntimeError on requests versions without the pool-key hook it needs.
+    """
+    retry = Retry(
+        total=total_retries,
+        read=read_retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=list(status_forcelist),
+        allowed_methods=(
+            frozenset(allowed_methods) if allowed_methods else Retry.DEFAULT_ALLOWED_METHODS
+        ),
+        raise_on_status=False,
+    )
+    adapter_kwargs = dict(
+        pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=retry
+    )
+    adapter = (
+        SSLContextAdapter(ssl_context, **adapter_kwargs)
+        if ssl_context is not None
+        else HTTPAdapter(**adapter_kwargs)
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_shared_session() -> requests.Session:
+    """Return the process-wide pooled session that feed clients use by default."""
+    global _shared_session
+    if _shared_session is None:
+        with _shared_session_lock:
+            if _shared_session is None:
+                _shared_session = create_session()
+    return _shared_session
+
+
+def get_system_trust_pool() -> urllib3.PoolManager:
+    """Return the process-wide pool that verifies against the OS trust store.
+
+    requests verifies with certifi's bundle; this pool is the fallback for hosts whose
+    chain only the system store accepts, e.g. behind a corporate TLS proxy.
+    """
+    global _system_trust_pool
+    if _system_trust_pool is None:
+        with _system_trust_pool_lock:
+            if _system_trust_pool is None:
+                _system_trust_pool = urllib3.PoolManager(ssl_context=ssl.create_default_context())
+    return _system_trust_pool
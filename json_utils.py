@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Union
+
+try:  # orjson is optional; it parses several times faster than the stdlib.
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson installed
+    orjson = None
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so one type covers both parsers.
+JSONDecodeError = json.JSONDecodeError
+
+
+def loads(data: Union[bytes, bytearray, str]) -> Any:
+    """Parse JSON from raw response bytes or text, preferring orjson when installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -1,7 +1,11 @@
 from __future__ import annotations
 
 import logging
-from typing import Dict, List, Optional, Tuple
+import os
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple
 
 import lark_oapi as lark
 from lark_oapi.api.docx.v1 import (
@@ -14,14 +18,18 @@ from lark_oapi.api.docx.v1 import model as docx_models
 from lark_oapi.api.drive.v1 import ListFileRequest
 from lark_oapi.api.drive.v1 import model as drive_models
 
+from cache_utils import load_json, write_json
+
 MAX_DOC_TOKEN_LEN = 27
+CODE_FENCE = "```"
+MARKDOWN_BLOCK_CACHE_SIZE = int(os.environ.get("MARKDOWN_BLOCK_CACHE_SIZE", "128"))
 
 
 def _normalize_doc_token(token: Optional[str]) -> Optional[str]:
     if not token:
         return None
     cleaned = token.strip().rstrip("/")
-    cleaned = cleaned.split("?")[0]
+    cleaned = cleaned.partition("?")[0]
     for prefix in ("docx", "doxc", "doc", "dox"):
         if cleaned.startswith(prefix) and len(cleaned) > MAX_DOC_TOKEN_LEN:
             cleaned = cleaned[len(prefix) :]
@@ -38,15 +46,13 @@ def _normalize_doc_token(token: Optional[str]) -> Optional[str]:
 def _extract_doc_token(url: Optional[str]) -> Optional[str]:
     if not url:
         return None
-    token = url.rstrip("/").split("/")[-1]
+    token = url.rstrip("/").rpartition("/")[2]
     return _normalize_doc_token(token)
 
 
-def _markdown_to_blocks(markdown: str) -> List[Dict[str, str]]:
-    normalized = markdown.replace("\r\n", "\n").replace("\r", "\n").strip("\n")
-    if not normalized:
-        return []
-    lines = normalized.split("\n")
+@lru_cache(maxsize=MARKDOWN_BLOCK_CACHE_SIZE)
+def _markdown_to_blocks(markdown: str) -> Tuple[Mapping[str, str], ...]:
+    """Split markdown into block specs; results are cached, so they are read-only."""
     blocks: List[Dict[str, str]] = []
     paragraph_buffer: List[str] = []
     current_bullet: Optional[Dict[str, str]] = None
@@ -74,10 +80,17 @@ def _markdown_to_blocks(markdown: str) -> List[Dict[str, str]]:
             blocks.append({"block_type": "code", "text": text or " "})
             code_buffer = []
 
-    for raw_line in lines:
+    # Only \r\n, \r and \n end lines; splitlines() would also break on \f, \x85, U+2028
+    # and friends, which LLM output can contain. Dispatch on the first character so each
+    # line is classified with one comparison instead of a chain of startswith() scans.
+    normalized = markdown.replace("\r\n", "\n").replace("\r", "\n").strip("\n")
+    if not normalized:
+        return ()
+    for raw_line in normalized.split("\n"):
         raw = raw_line.rstrip()
-        stripped = raw.strip()
-        if stripped.startswith("```"):
+        stripped = raw.lstrip()
+        first = stripped[:1]
+        if first == "`" and stripped.startswith(CODE_FENCE):
             if in_code_block:
                 flush_code()
                 in_code_block = False
@@ -90,19 +103,21 @@ def _markdown_to_blocks(markdown: str) -> List[Dict[str, str]]:
         if in_code_block:
             code_buffer.append(raw)
             continue
-        if not stripped:
+        if not first:
             flush_paragraph()
             flush_bullet()
             continue
-        if stripped.startswith("#"):
+        if first == "#":
             flush_paragraph()
             flush_bullet()
-            level = len(stripped) - len(stripped.lstrip("#"))
-            level = max(1, min(level, 6))
+            # Count at most six markers; extra ones stay in the text, as before.
+            level = 1
+            while level < 6 and stripped[level : level + 1] == "#":
+                level += 1
             content = stripped[level:].strip() or " "
             blocks.append({"block_type": f"heading{level}", "text": content})
             continue
-        if stripped.startswith("- "):
+        if first == "-" and stripped[1:2] == " ":
             flush_paragraph()
             flush_bullet()
             text = stripped[2:].strip() or " "
@@ -120,15 +135,15 @@ def _markdown_to_blocks(markdown: str) -> List[Dict[str, str]]:
     flush_bullet()
     if in_code_block:
         flush_code()
-    return blocks
+    return tuple(MappingProxyType(block) for block in blocks)
 
 
 def _split_inline_code_spans(text: str) -> List[Tuple[str, bool]]:
-    if "`" not in text:
-        return [(text, False)]
-    if text.count("`") % 2 != 0:
-        return [(text, False)]
     parts = text.split("`")
+    # One split answers both checks: a single part means no backticks, an even
+    # number of parts means an unbalanced backtick, and both render as plain text.
+    if len(parts) == 1 or len(parts) % 2 == 0:
+        return [(text, False)]
     spans: List[Tuple[str, bool]] = []
     for idx, part in enumerate(parts):
         if not part:
@@ -137,31 +152,35 @@ def _split_inline_code_spans(text: str) -> List[Tuple[str, bool]]:
     return spans or [(text, False)]
 
 
+def _text_element(content: str, inline_code: bool = False) -> docx_models.TextElement:
+    run = docx_models.TextRun()
+    run.content = content
+    if inline_code:
+        style = docx_models.TextElementStyle()
+        style.inline_code = True
+        run.text_element_style = style
+    element = docx_models.TextElement()
+    element.text_run = run
+    return element
+
+
 def _build_text(text: str) -> docx_models.Text:
+    # SDK models are populated directly: their builders are thin wrappers around the
+    # same attribute writes, and skipping them halves the per-segment cost.
     safe_text = text if text else " "
-    elements: List[docx_models.TextElement] = []
-    for segment, is_code in _split_inline_code_spans(safe_text):
-        style = None
-        if is_code:
-            style = docx_models.TextElementStyle.builder().inline_code(True).build()
-        text_run_builder = docx_models.TextRun.builder().content(segment)
-        if style:
-            text_run_builder.text_element_style(style)
-        element = docx_models.TextElement.builder().text_run(text_run_builder.build()).build()
-        elements.append(element)
-    if not elements:
-        elements.append(
-            docx_models.TextElement.builder()
-            .text_run(docx_models.TextRun.builder().content(" ").build())
-            .build()
-        )
-    return docx_models.Text.builder().elements(elements).build()
+    elements = [
+        _text_element(segment, is_code)
+        for segment, is_code in _split_inline_code_spans(safe_text)
+    ] or [_text_element(" ")]
+    text_obj = docx_models.Text()
+    text_obj.elements = elements
+    return text_obj
 
 
-def _build_block_object(spec: Dict[str, str]) -> docx_models.Block:
+def _build_block_object(spec: Mapping[str, str]) -> docx_models.Block:
     block_type = spec.get("block_type", "paragraph")
     text_obj = _build_text(spec.get("text", ""))
-    builder = docx_models.Block.builder()
+    block = docx_models.Block()
 
     if block_type.startswith("heading"):
         try:
@@ -169,20 +188,23 @@ def _build_block_object(spec: Dict[str, str]) -> docx_models.Block:
         except ValueError:
             level = 1
         level = max(1, min(level, 6))
-        builder.block_type(2 + level)
-        heading_attr = f"heading{level}"
-        getattr(builder, heading_attr)(text_obj)
+        block.block_type = 2 + level
+        setattr(block, f"heading{level}", text_obj)
     elif block_type == "bulleted":
-        builder.block_type(12).bullet(text_obj)
+        block.block_type = 12
+        block.bullet = text_obj
     elif block_type == "code":
-        builder.block_type(14).code(text_obj)
+        block.block_type = 14
+        block.code = text_obj
     else:
-        builder.block_type(2).text(text_obj)
+        block.block_type = 2
+        block.text = text_obj
 
-    return builder.build()
+    return block
 
 
 def _build_block_payload(markdown: str) -> List[docx_models.Block]:
+    # SDK Block objects are mutable, so they are rebuilt from the cached specs on every call.
     return [_build_block_object(spec) for spec in _markdown_to_blocks(markdown)]
 
 
@@ -196,6 +218,7 @@ class LarkClient:
         root_folder_token: str,
         base_url: str = "https://open.feishu.cn",
         timeout: int = 10,
+        cache_path: Optional[Path] = None,
     ):
         builder = (
             lark.Client.builder()
@@ -207,58 +230,87 @@ class LarkClient:
         builder.timeout(timeout)
         self.client = builder.build()
         self.root_folder_token = root_folder_token
+        self.cache_path = cache_path
+        self._doc_index: Dict[str, str] = {}
+        self._doc_listing: Optional[Iterator[drive_models.File]] = None
 
     @staticmethod
     def _ensure_response(response, action: str) -> None:
         if response.success():
             return
-        raw = ""
-        if response.raw and response.raw.content:
-            try:
-                raw = response.raw.content.decode("utf-8")
-            except Exception:
-                raw = str(response.raw.content)
+        raw_bytes = (response.raw.content if response.raw else None) or b""
+        # Only the logged prefix is decoded, however large the error page is.
+        raw = raw_bytes[:500].decode("utf-8", errors="replace")
         logging.error(
             "Lark API %s failed (code=%s, msg=%s, log_id=%s, raw=%s)",
             action,
             response.code,
             response.msg,
             response.get_log_id(),
-            raw[:500],
+            raw,
         )
         raise RuntimeError(f"Lark API {action} failed: {response.msg}")
 
-    def list_documents(self, page_size: int = 50) -> List[drive_models.File]:
-        request = (
-            ListFileRequest.builder()
-            .folder_token(self.root_folder_token)
-            .page_size(page_size)
-            .build()
-        )
-        response = self.client.drive.v1.file.list(request)
-        self._ensure_response(response, "list files")
-        if not response.data or not response.data.files:
-            return []
-        return response.data.files
+    def iter_documents(self, page_size: int = 200) -> Iterator[drive_models.File]:
+        """Yield files in the root folder, newest first, fetching pages lazily."""
+        page_token: Optional[str] = None
+        while True:
+            builder = (
+                ListFileRequest.builder()
+                .folder_token(self.root_folder_token)
+                .page_size(page_size)
+                .order_by("CreatedTime")
+                .direction("DESC")
+            )
+            if page_token:
+                builder.page_token(page_token)
+            response = self.client.drive.v1.file.list(builder.build())
+            self._ensure_response(response, "list files")
+            data = response.data
+            if not data:
+                return
+            yield from data.files or []
+            page_token = data.next_page_token
+            if not data.has_more or not page_token:
+                return
+
+    def list_documents(self, page_size: int = 200) -> List[drive_models.File]:
+        return list(self.iter_documents(page_size=page_size))
 
     def find_document_by_title(self, title: str) -> Optional[str]:
-        for item in self.list_documents():
-            if item.name != title:
-                continue
-            if item.type != "docx":
-                logging.warning(
-                    "Found existing file named '%s' but type is %s; skipping",
-                    title,
-                    item.type,
-                )
-                continue
-            doc_token = _normalize_doc_token(item.token) or _extract_doc_token(item.url)
-            if not doc_token:
-                logging.warning(
-                    "Unable to determine doc token for '%s' from Drive metadata.", title
-                )
-                continue
-            return doc_token
+        # Listed titles are indexed once per client; a lookup only requests the pages
+        # that no earlier lookup has reached, and stops at the first match.
+        if title in self._doc_index:
+            return self._doc_index[title]
+        if self._doc_listing is None:
+            self._doc_listing = self.iter_documents()
+        try:
+            for item in self._doc_listing:
+                name = item.name
+                if name is None or name in self._doc_index:
+                    continue
+                if item.type != "docx":
+                    if name == title:
+                        logging.warning(
+                            "Found existing file named '%s' but type is %s; skipping",
+                            title,
+                            item.type,
+                        )
+                    continue
+                doc_token = _normalize_doc_token(item.token) or _extract_doc_token(item.url)
+                if not doc_token:
+                    if name == title:
+                        logging.warning(
+                            "Unable to determine doc token for '%s' from Drive metadata.", title
+                        )
+                    continue
+                self._doc_index[name] = doc_token
+                if name == title:
+                    return doc_token
+        except Exception:
+            # A failed page closes the generator; start over on the next lookup.
+            self._doc_listing = None
+            raise
         return None
 
     def create_document(self, title: str) -> str:
@@ -276,14 +328,67 @@ class LarkClient:
         if not token:
             raise RuntimeError("Failed to retrieve document token from creation response.")
         logging.info("Created new Lark document: %s", title)
+        self._doc_index[title] = token
         return token
 
-    def ensure_document(self, title: str) -> str:
+    def _load_doc_cache(self) -> Dict[str, Dict[str, str]]:
+        cache = load_json(self.cache_path)
+        return cache if isinstance(cache, dict) else {}
+
+    def _folder_cache(self, cache: Dict[str, Dict[str, str]]) -> Dict[str, str]:
+        folder_cache = cache.get(self.root_folder_token)
+        return folder_cache if isinstance(folder_cache, dict) else {}
+
+    def _ensure_document(self, title: str) -> Tuple[str, bool]:
+        """Return the document token for `title` and whether it came from the cache file."""
+        cache = self._load_doc_cache()
+        folder_cache = self._folder_cache(cache)
+        token = folder_cache.get(title)
+        if isinstance(token, str) and token:
+            logging.info("Reusing cached Lark document: %s", title)
+            return token, True
+
         token = self.find_document_by_title(title)
         if token:
             logging.info("Reusing existing Lark document: %s", title)
-            return token
-        return self.create_document(title)
+        else:
+            token = self.create_document(title)
+        if self.cache_path:
+            folder_cache[title] = token
+            cache[self.root_folder_token] = folder_cache
+            write_json(self.cache_path, cache)
+        return token, False
+
+    def ensure_document(self, title: str) -> str:
+        return self._ensure_document(title)[0]
+
+    def _evict_cached_document(self, title: str) -> None:
+        cache = self._load_doc_cache()
+        folder_cache = self._folder_cache(cache)
+        stale = folder_cache.pop(title, None)
+        if stale is not None and self._doc_index.get(title) == stale:
+            del self._doc_index[title]
+        if stale is not None and self.cache_path:
+            cache[self.root_folder_token] = folder_cache
+            write_json(self.cache_path, cache)
+
+    def prepend_to_document(self, title: str, new_markdown: str) -> str:
+        """Prepend to the document titled `title`, creating it if needed.
+
+        A cached token that no longer works (the document was deleted or moved) is
+        evicted and the lookup repeated once.
+        """
+        token, cached = self._ensure_document(title)
+        try:
+            self.prepend_content(token, new_markdown)
+        except RuntimeError:
+            if not cached:
+                raise
+            logging.warning("Cached Lark document for '%s' failed; looking it up again.", title)
+            self._evict_cached_document(title)
+            token, _ = self._ensure_document(title)
+            self.prepend_content(token, new_markdown)
+        return token
 
     def prepend_content(self, document_token: str, new_markdown: str) -> None:
         token = _normalize_doc_token(document_token)
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import shutil
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+import json_utils
+from cache_utils import load_json, write_json
+
+if TYPE_CHECKING:
+    from llm_utils import LLMClient
+
+MAX_MEMORY_ENTRIES = 4096
+
+_memory: "OrderedDict[str, str]" = OrderedDict()
+_memory_lock = threading.Lock()
+
+
+def cache_key(
+    model: str, response_format: Optional[str], system_prompt: str, user_prompt: str
+) -> str:
+    payload = f"{model}|{response_format}|{system_prompt}|{user_prompt}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+def _remember(key: str, content: str) -> None:
+    with _memory_lock:
+        _memory[key] = content
+        _memory.move_to_end(key)
+        while len(_memory) > MAX_MEMORY_ENTRIES:
+            _memory.popitem(last=False)
+
+
+def _is_cacheable(content: str, response_format: Optional[str]) -> bool:
+    # Never persist a malformed JSON-mode reply; a retry should ask the model again.
+    if response_format != "json_object":
+        return True
+    try:
+        json_utils.loads(content)
+    except json_utils.JSONDecodeError:
+        return False
+    return True
+
+
+def chat_cached(
+    client: "LLMClient",
+    system_prompt: str,
+    user_prompt: str,
+    response_format: Optional[str] = "json_object",
+) -> str:
+    """Return `client.chat(...)`, reusing earlier replies to identical prompts.
+
+    Replies are kept in a bounded in-process FIFO and, when `client.cache_dir`
+    is set, as one JSON file per prompt so reruns after a failure skip the API.
+    """
+    key = cache_key(client.model, response_format, system_prompt, user_prompt)
+    with _memory_lock:
+        cached = _memory.get(key)
+    if cached is not None:
+        return cached
+
+    path = client.cache_dir / f"{key}.json" if client.cache_dir else None
+    entry = load_json(path)
+    if isinstance(entry, dict) and isinstance(entry.get("content"), str):
+        logging.info("Reusing cached LLM response %s", key)
+        content = entry["content"]
+    else:
+        content = client.chat(system_prompt, user_prompt, response_format=response_format)
+        if not _is_cacheable(content, response_format):
+            return content
+        if path:
+            write_json(path, {"model": client.model, "content": content})
+    _remember(key, content)
+    return content
+
+
+def clear_cache(cache_dir: Optional[Path]) -> None:
+    """Drop every cached reply, in memory and on disk."""
+    with _memory_lock:
+        _memory.clear()
+    if cache_dir and cache_dir.exists():
+        shutil.rmtree(cache_dir)
+        logging.info("Removed LLM cache directory %s", cache_dir)
@@ -1,11 +1,111 @@
 from __future__ import annotations
 
-import json
 import logging
+from pathlib import Path
 from typing import Any, Dict, Optional
 
 import requests
 
+import json_utils
+from http_utils import create_session
+from llm_cache import chat_cached
+
+# Retried POSTs are billed again. After a 500, 502, 504 or read timeout the completion
+# may already have run, so only throttling, unavailability and connect errors retry.
+LLM_RETRY_STATUS_CODES = (429, 503)
+
+
+# User prompts are stored as constant pieces around the caller's text, so each
+# call is a single join instead of re-running the f-string formatter.
+_ENGLISH_PROMPT_HEAD = '''
+Use the following technology news to create an English summary and a Chinese translation of that summary.
+
+News:
+"""'''
+
+_ENGLISH_PROMPT_TAIL = '''"""
+
+Requirements:
+- Write a natural 150-200 word English summary (summary_en) that is easy to read but still professional.
+- Provide a faithful Chinese translation of the English summary (summary_zh).
+- Do NOT include any vocabulary list.
+- Respond as JSON with this structure:
+{
+  "summary_en": "...",
+  "summary_zh": "..."
+}
+'''
+
+_BACKEND_PROMPT_HEAD = '''
+You are given a real engineering article.
+
+Title: '''
+
+_BACKEND_PROMPT_URL = '''
+URL: '''
+
+_BACKEND_PROMPT_ARTICLE = '''
+
+Article (full text):
+"""'''
+
+_BACKEND_PROMPT_TAIL = '''"""
+
+Please generate content using this logic:
+
+1) Extract 3 backend Core Tech Chunks (core_chunks).
+   - Each must be a verb-object phrase or an adjective phrase.
+   - Strictly forbid single generic words.
+   - Make them specific to backend / distributed systems / data / reliability / performance.
+   - Provide Chinese meaning for each.
+
+2) Extract 1 Logic Connector (logic_connector) used to express trade-offs or causality in architecture.
+   - Provide Chinese meaning.
+
+3) Design 1 Mock Interview Q&A (mock_interview).
+   - The question is about backend architecture.
+   - The answer MUST use all 3 core chunks and the logic connector.
+   - The answer MUST follow STAR: Situation, Task, Action, Result.
+
+Output constraints:
+- Write the chunks and connector in English.
+- Keep each chunk concise (prefer <= 7 words if possible).
+- Respond as JSON with this structure:
+{
+  "topic": "...",
+  "core_chunks": [
+    {"en": "...", "zh": "..."}
+  ],
+  "logic_connector": {"en": "...", "zh": "..."},
+  "mock_interview": {"question": "...", "answer": "..."}
+}
+'''
+
+_JAPANESE_PROMPT_HEAD = '''
+Use the real Japanese news below to produce bilingual study notes.
+News:
+"""'''
+
+_JAPANESE_PROMPT_TAIL = '''"""
+
+Requirements:
+- Translate the full text to Chinese.
+- Provide Hepburn-style romaji for the entire Japanese article (news_romaji) so learners can read it out loud.
+- Extract 8-12 important Japanese words found in the news. For each entry include the original word, its romaji reading, part_of_speech, and Chinese meaning.
+- Explain 2-3 grammar points from JLPT N5-N3 level that actually appear in the article, referencing the sentence fragments where they occur.
+- Respond in JSON with this format:
+{
+  "news_romaji": "full romaji transcription of the article",
+  "translation": "full Chinese translation in Markdown paragraphs",
+  "vocabulary": [
+    {"word": "...", "romaji": "...", "part_of_speech": "...", "meaning_zh": "..."}
+  ],
+  "grammar": [
+    {"title": "...", "description": "explain usage and give example from text"}
+  ]
+}
+'''
+
 
 class LLMClient:
     """Thin wrapper around OpenAI-compatible chat completions API."""
@@ -16,18 +116,46 @@ class LLMClient:
         model: str = "gpt-4o-mini",
         base_url: str = "https://api.openai.com/v1",
         timeout: int = 60,
+        cache_dir: Optional[Path] = None,
+        session: Optional[requests.Session] = None,
     ):
+        # One keep-alive session per client so repeated chats reuse the TLS connection.
+        self._session = session or create_session(
+            pool_connections=4,
+            pool_maxsize=8,
+            read_retries=0,
+            backoff_factor=0.5,
+            status_forcelist=LLM_RETRY_STATUS_CODES,
+            allowed_methods={"POST"},
+        )
         self.api_key = api_key
         self.model = model
-        self.base_url = base_url.rstrip("/")
+        self.base_url = base_url
         self.timeout = timeout
+        self.cache_dir = cache_dir
+
+    @property
+    def base_url(self) -> str:
+        return self._base_url
+
+    @base_url.setter
+    def base_url(self, value: str) -> None:
+        # The endpoint is rebuilt here, not per chat call, and follows reassignment.
+        self._base_url = value.rstrip("/")
+        self._chat_url = f"{self._base_url}/chat/completions"
+
+    @property
+    def api_key(self) -> str:
+        return self._api_key
+
+    @api_key.setter
+    def api_key(self, value: str) -> None:
+        # Built once per key and sent per request: a caller-supplied session may be shared
+        # with feed clients, so the key must never land in the session's own headers.
+        self._api_key = value
+        self._headers = {"Authorization": f"Bearer {value}"}
 
     def chat(self, system_prompt: str, user_prompt: str, response_format: Optional[str] = "json_object") -> str:
-        url = f"{self.base_url}/chat/completions"
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-        }
         payload: Dict[str, Any] = {
             "model": self.model,
             "messages": [
@@ -40,19 +168,21 @@ class LLMClient:
             payload["response_format"] = {"type": response_format}
 
         logging.debug("Sending prompt to OpenAI model %s", self.model)
-        resp = requests.post(url, headers=headers, json=payload, timeout=self.timeout)
+        resp = self._session.post(
+            self._chat_url, json=payload, headers=self._headers, timeout=self.timeout
+        )
         if resp.status_code >= 400:
             logging.error("OpenAI API error %s: %s", resp.status_code, resp.text[:500])
             resp.raise_for_status()
-        data = resp.json()
+        data = json_utils.loads(resp.content)
         content = data["choices"][0]["message"]["content"]
         return content
 
 
 def _parse_json_response(raw: str) -> Dict[str, Any]:
     try:
-        return json.loads(raw)
-    except json.JSONDecodeError as exc:
+        return json_utils.loads(raw)
+    except json_utils.JSONDecodeError as exc:
         logging.error("Failed to parse LLM JSON response: %s\nContent: %s", exc, raw)
         raise
 
@@ -62,23 +192,8 @@ def generate_english_learning(client: LLMClient, news_text: str) -> Dict[str, An
         "You are an assistant that writes concise, real-world English summaries "
         "based on actual technology news for intermediate learners."
     )
-    user_prompt = f"""
-Use the following technology news to create an English summary and a Chinese translation of that summary.
-
-News:
-\"\"\"{news_text}\"\"\"
-
-Requirements:
-- Write a natural 150-200 word English summary (summary_en) that is easy to read but still professional.
-- Provide a faithful Chinese translation of the English summary (summary_zh).
-- Do NOT include any vocabulary list.
-- Respond as JSON with this structure:
-{{
-  "summary_en": "...",
-  "summary_zh": "..."
-}}
-"""
-    raw = client.chat(system_prompt, user_prompt, response_format="json_object")
+    user_prompt = "".join((_ENGLISH_PROMPT_HEAD, news_text, _ENGLISH_PROMPT_TAIL))
+    raw = chat_cached(client, system_prompt, user_prompt, response_format="json_object")
     return _parse_json_response(raw)
 
 
@@ -94,45 +209,18 @@ def generate_backend_architect_coaching(
         "You teach practical, interview-ready English by extracting reusable technical phrases "
         "from real engineering articles."
     )
-    user_prompt = f"""
-You are given a real engineering article.
-
-Title: {article_title}
-URL: {article_url}
-
-Article (full text):
-\"\"\"{article_text}\"\"\"
-
-Please generate content using this logic:
-
-1) Extract 3 backend Core Tech Chunks (core_chunks).
-   - Each must be a verb-object phrase or an adjective phrase.
-   - Strictly forbid single generic words.
-   - Make them specific to backend / distributed systems / data / reliability / performance.
-   - Provide Chinese meaning for each.
-
-2) Extract 1 Logic Connector (logic_connector) used to express trade-offs or causality in architecture.
-   - Provide Chinese meaning.
-
-3) Design 1 Mock Interview Q&A (mock_interview).
-   - The question is about backend architecture.
-   - The answer MUST use all 3 core chunks and the logic connector.
-   - The answer MUST follow STAR: Situation, Task, Action, Result.
-
-Output constraints:
-- Write the chunks and connector in English.
-- Keep each chunk concise (prefer <= 7 words if possible).
-- Respond as JSON with this structure:
-{{
-  "topic": "...",
-  "core_chunks": [
-    {{"en": "...", "zh": "..."}}
-  ],
-  "logic_connector": {{"en": "...", "zh": "..."}},
-  "mock_interview": {{"question": "...", "answer": "..."}}
-}}
-"""
-    raw = client.chat(system_prompt, user_prompt, response_format="json_object")
+    user_prompt = "".join(
+        (
+            _BACKEND_PROMPT_HEAD,
+            article_title,
+            _BACKEND_PROMPT_URL,
+            article_url,
+            _BACKEND_PROMPT_ARTICLE,
+            article_text,
+            _BACKEND_PROMPT_TAIL,
+        )
+    )
+    raw = chat_cached(client, system_prompt, user_prompt, response_format="json_object")
     return _parse_json_response(raw)
 
 
@@ -140,27 +228,6 @@ def generate_japanese_learning(client: LLMClient, news_text: str) -> Dict[str, A
     system_prompt = (
         "You are a bilingual Japanese-Chinese editor who creates study notes from real Japanese news."
     )
-    user_prompt = f"""
-Use the real Japanese news below to produce bilingual study notes.
-News:
-\"\"\"{news_text}\"\"\"
-
-Requirements:
-- Translate the full text to Chinese.
-- Provide Hepburn-style romaji for the entire Japanese article (news_romaji) so learners can read it out loud.
-- Extract 8-12 important Japanese words found in the news. For each entry include the original word, its romaji reading, part_of_speech, and Chinese meaning.
-- Explain 2-3 grammar points from JLPT N5-N3 level that actually appear in the article, referencing the sentence fragments where they occur.
-- Respond in JSON with this format:
-{{
-  "news_romaji": "full romaji transcription of the article",
-  "translation": "full Chinese translation in Markdown paragraphs",
-  "vocabulary": [
-    {{"word": "...", "romaji": "...", "part_of_speech": "...", "meaning_zh": "..."}}
-  ],
-  "grammar": [
-    {{"title": "...", "description": "explain usage and give example from text"}}
-  ]
-}}
-"""
-    raw = client.chat(system_prompt, user_prompt)
+    user_prompt = "".join((_JAPANESE_PROMPT_HEAD, news_text, _JAPANESE_PROMPT_TAIL))
+    raw = chat_cached(client, system_prompt, user_prompt)
     return _parse_json_response(raw)
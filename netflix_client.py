@@ -1,20 +1,69 @@
 from __future__ import annotations
 
 import logging
-import subprocess
+import os
+import re
+import ssl
+import threading
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from email.utils import parsedate_to_datetime
+from functools import lru_cache
 from html import unescape
 from html.parser import HTMLParser
-from typing import List, Optional, Union
+from itertools import groupby
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
 from xml.etree import ElementTree as ET
 
 import requests
+import urllib3
 from requests import exceptions as requests_exceptions
 
+from feeds import parse_pubdate
+from http_utils import create_session, get_shared_session, get_system_trust_pool
 
-@dataclass
+# Characters of HTML parsed per character of text kept when max_chars applies;
+# blog markup typically runs about 3x its visible text.
+HTML_TEXT_HEADROOM = 4
+# Bytes handed to the XML parser per read while the feed downloads.
+FEED_CHUNK_SIZE = 64 * 1024
+HTML_TEXT_CACHE_SIZE = int(os.environ.get("HTML_TEXT_CACHE_SIZE", "128"))
+# Snippets shorter than this are tried with a regex tag stripper before HTMLParser.
+HTML_FAST_PATH_MAX_CHARS = 512
+
+_BLOCK_TAGS = frozenset({"p", "div", "section", "article", "br", "hr"})
+_HEADING_TAGS = frozenset({"h1", "h2", "h3", "h4", "h5", "h6"})
+# Text emitted when a tag opens or closes; one dict lookup classifies each tag.
+_START_TAG_TEXT = {**dict.fromkeys(_BLOCK_TAGS | _HEADING_TAGS, "\n"), "li": "\n- ", "pre": "\n"}
+_END_TAG_TEXT = {"p": "\n", "li": "\n", "pre": "\n"}
+# Raw-text elements whose contents are never visible prose.
+_SKIPPED_TAGS = frozenset({"script", "style", "noscript", "template"})
+# Tags that make the parser emit newlines or drop text; their presence rules out the fast path.
+_STRUCTURAL_TAGS = frozenset(_START_TAG_TEXT) | frozenset(_END_TAG_TEXT) | _SKIPPED_TAGS
+# A well-formed start or end tag, attribute values quoted or bare; the name is captured.
+_SIMPLE_TAG_RE = re.compile(
+    r"""</?([a-zA-Z][^\t\n\r\f />\x00]*)(?:[^<>"']|"[^"<]*"|'[^'<]*')*>"""
+)
+# One parser per thread, reset between articles instead of rebuilt.
+_parser_local = threading.local()
+
+
+def _collapse_whitespace(text: str) -> str:
+    """Collapse whitespace runs to one space, keeping a single space at either edge.
+
+    str.split() is Unicode-aware (&nbsp;, ideographic spaces) and benchmarks about
+    2.5x faster than an equivalent compiled re.sub(r"\\s+", " ", ...).
+    """
+    words = " ".join(text.split())
+    if not words:
+        return " "
+    if text[0].isspace():
+        words = " " + words
+    if text[-1].isspace():
+        words += " "
+    return words
+
+
+@dataclass(slots=True)
 class NetflixTechBlogItem:
     title: str
     link: str
@@ -22,58 +71,138 @@ class NetflixTechBlogItem:
     content: str
 
 
+class _StopParse(Exception):
+    """Raised from a handler once enough text has been collected."""
+
+
 class _HTMLToText(HTMLParser):
-    def __init__(self) -> None:
-        super().__init__()
+    def reset(self) -> None:
+        # HTMLParser.__init__ calls reset(), so this also sets up a fresh instance.
+        super().reset()
         self._chunks: List[str] = []
+        self._append = self._chunks.append
         self._in_pre = False
+        self._skip_depth = 0
+        self._text_budget = 0
+        self._text_len = 0
 
     def handle_starttag(self, tag: str, attrs) -> None:  # type: ignore[override]
-        if tag in {"p", "div", "section", "article", "br", "hr"}:
-            self._chunks.append("\n")
-        if tag in {"h1", "h2", "h3", "h4", "h5", "h6"}:
-            self._chunks.append("\n")
-        if tag in {"li"}:
-            self._chunks.append("\n- ")
-        if tag == "pre":
-            self._in_pre = True
-            self._chunks.append("\n")
+        text = _START_TAG_TEXT.get(tag)
+        if text is not None:
+            if tag == "pre":
+                self._in_pre = True
+            self._append(text)
+        elif tag in _SKIPPED_TAGS:
+            self._skip_depth += 1
 
     def handle_endtag(self, tag: str) -> None:  # type: ignore[override]
-        if tag == "pre":
-            self._in_pre = False
-            self._chunks.append("\n")
-        if tag in {"p", "li"}:
-            self._chunks.append("\n")
+        text = _END_TAG_TEXT.get(tag)
+        if text is not None:
+            if tag == "pre":
+                self._in_pre = False
+            self._append(text)
+        elif tag in _SKIPPED_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
 
     def handle_data(self, data: str) -> None:  # type: ignore[override]
-        if not data:
+        if not data or self._skip_depth:
             return
-        text = unescape(data)
+        # convert_charrefs (on by default) already decoded entities; decoding again
+        # would cost a second pass and turn "&amp;lt;" into "<".
+        text = data
         if not self._in_pre:
-            text = " ".join(text.split())
-        self._chunks.append(text)
+            # Keep one space at the edges so words split by inline tags stay apart.
+            text = _collapse_whitespace(text)
+            if text[:1] == " " and self._chunks and self._chunks[-1][-1:] == " ":
+                text = text[1:]
+            if not text:
+                return
+        self._append(text)
+        if self._text_budget:
+            self._text_len += len(text)
+            if self._text_len > self._text_budget:
+                raise _StopParse
 
     def get_text(self) -> str:
-        joined = "".join(self._chunks)
-        lines = [line.strip() for line in joined.splitlines()]
-        compact: List[str] = []
-        for line in lines:
-            if not line:
-                if compact and compact[-1] != "":
-                    compact.append("")
-                continue
-            compact.append(line)
-        return "\n".join(compact).strip()
+        text = "".join(self._chunks).replace("\r\n", "\n").replace("\r", "\n")
+        # Strip each line, then collapse runs of blank lines into a single separator.
+        # split("\n") rather than splitlines(): only newlines the parser emitted break lines.
+        lines = (line.strip() for line in text.split("\n"))
+        return "\n".join(
+            "\n".join(run) if nonblank else "" for nonblank, run in groupby(lines, key=bool)
+        ).strip()
+
+
+def _strip_inline_markup(html: str) -> Optional[str]:
+    """Return the text of a snippet holding only inline tags, or None if it needs the parser.
+
+    Matches HTMLParser output for `<p>...</p>`-wrapped descriptions with links and emphasis.
+    """
+    html = html.strip()
+    if html.startswith("<p>") and html.endswith("</p>"):
+        # A lone wrapping paragraph only adds newlines that get_text strips again.
+        html = html[3:-4]
+    pieces = _SIMPLE_TAG_RE.split(html)
+    texts = pieces[::2]
+    if any(name.lower() in _STRUCTURAL_TAGS for name in pieces[1::2]):
+        return None
+    # A stray "<" is text or malformed markup to HTMLParser, and it holds back a trailing
+    # "&" as a possible partial entity; both stay on the parser path.
+    if "&" in texts[-1] or any("<" in text for text in texts):
+        return None
+    # Entities are decoded per text run, as convert_charrefs does between tags.
+    return " ".join("".join(map(unescape, texts)).split())
+
+
+@lru_cache(maxsize=HTML_TEXT_CACHE_SIZE)
+def _html_to_text_cached(html: str, max_chars: int) -> str:
+    # Polls re-deliver the same items, so converted text is memoized per (html, max_chars).
+    if "<" not in html and "&" not in html:
+        # Plain-text snippets need only the whitespace collapse the parser would apply.
+        return " ".join(html.split())
+    if len(html) < HTML_FAST_PATH_MAX_CHARS:
+        text = _strip_inline_markup(html)
+        if text is not None:
+            return text
+    parser = getattr(_parser_local, "parser", None)
+    if parser is None:
+        parser = _parser_local.parser = _HTMLToText()
+    # Stop once there is comfortably more text than truncation will keep.
+    parser._text_budget = max_chars + max_chars // 2
+    try:
+        try:
+            parser.feed(html)
+        except _StopParse:
+            pass
+        return parser.get_text()
+    finally:
+        # Drops the article's chunks and any half-parsed trailing markup.
+        parser.reset()
+
+
+def _iter_xml_events(chunks: Iterable[bytes]) -> Iterator[Tuple[str, ET.Element]]:
+    """Yield (event, element) pairs as each chunk is parsed, like iterparse over a stream."""
+    parser = ET.XMLPullParser(events=("start", "end"))
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from parser.read_events()
+    # Raises ParseError on a truncated document, as iterparse does at EOF.
+    parser.close()
+    yield from parser.read_events()
 
 
 class NetflixTechBlogRSSClient:
-    """Fetches latest articles from Netflix Tech Blog RSS feed."""
+    """Fetches latest articles from Netflix Tech Blog RSS feed.
+
+    Concurrent fetch_latest calls are safe: each thread converts HTML with its own parser.
+    """
 
     CONTENT_NAMESPACES = {
         "content": "http://purl.org/rss/1.0/modules/content/",
         "dc": "http://purl.org/dc/elements/1.1/",
     }
+    # Clark notation lets findtext match the tag without resolving a prefix per item.
+    CONTENT_ENCODED_TAG = f"{{{CONTENT_NAMESPACES['content']}}}encoded"
 
     def __init__(
         self,
@@ -89,45 +218,39 @@ class NetflixTechBlogRSSClient:
     ):
         self.feed_url = feed_url
         self.fallback_feed_urls = [url for url in (fallback_feed_urls or []) if url]
-        self.session = session or requests.Session()
+        self.session = session or get_shared_session()
         self.timeout = timeout
         self.max_chars = max_chars
         self.verify: Union[bool, str] = ca_bundle if ca_bundle else verify
+        if ca_bundle and session is None:
+            # A dedicated session parses the bundle once instead of per new connection.
+            try:
+                context = ssl.create_default_context(cafile=ca_bundle)
+                self.session = create_session(ssl_context=context)
+            except (OSError, ssl.SSLError, RuntimeError) as exc:
+                logging.warning("Passing CA bundle %s per request instead: %s", ca_bundle, exc)
+            else:
+                self.verify = True
         self.allow_insecure_fallback = allow_insecure_fallback
         self.allow_curl_fallback = allow_curl_fallback
 
-    def _fetch_via_curl(self) -> bytes:
-        timeout = max(1, int(self.timeout))
-        cmd = [
-            "curl",
-            "-fsSL",
-            "--max-time",
-            str(timeout),
-            self.feed_url,
-        ]
-        result = subprocess.run(cmd, check=False, capture_output=True)
-        if result.returncode != 0:
-            stderr = (result.stderr or b"").decode("utf-8", errors="replace")
-            raise RuntimeError(f"curl failed fetching {self.feed_url}: {stderr[:500]}")
-        return result.stdout
-
-    def _parse_datetime(self, value: Optional[str]) -> datetime:
-        if not value:
-            return datetime.now(timezone.utc)
+    def _fetch_with_system_trust(self, url: str) -> bytes:
         try:
-            dt = parsedate_to_datetime(value)
-            if dt.tzinfo is None:
-                dt = dt.replace(tzinfo=timezone.utc)
-            return dt
-        except (TypeError, ValueError):
-            logging.debug("Unable to parse pubDate '%s'", value)
-            return datetime.now(timezone.utc)
+            resp = get_system_trust_pool().request(
+                "GET", url, timeout=urllib3.Timeout(total=self.timeout)
+            )
+        except urllib3.exceptions.HTTPError as exc:
+            raise RuntimeError(f"System trust store fetch failed for {url}: {exc}") from exc
+        if resp.status >= 400:
+            raise RuntimeError(f"System trust store fetch of {url} returned HTTP {resp.status}")
+        return resp.data
+
+    def _parse_datetime(self, value: Optional[str], default: Optional[datetime] = None) -> datetime:
+        return parse_pubdate(value, default)
 
     @staticmethod
-    def _html_to_text(html: str) -> str:
-        parser = _HTMLToText()
-        parser.feed(html)
-        return parser.get_text()
+    def _html_to_text(html: str, max_chars: int = 0) -> str:
+        return _html_to_text_cached(html, max_chars)
 
     def _candidate_feed_urls(self) -> List[str]:
         urls = [self.feed_url]
@@ -136,15 +259,22 @@ class NetflixTechBlogRSSClient:
                 urls.append(url)
         return urls
 
+    def _fetch_items(
+        self, url: str, *, verify: Union[bool, str], limit: int
+    ) -> List[NetflixTechBlogItem]:
+        # The body is parsed as it downloads and the connection closed at `limit`,
+        # so the rest of the feed is never read or buffered.
+        with self.session.get(url, timeout=self.timeout, verify=verify, stream=True) as resp:
+            resp.raise_for_status()
+            # iter_content undoes gzip and yields each chunk as soon as it arrives.
+            return self._parse_items(resp.iter_content(FEED_CHUNK_SIZE), limit=limit)
+
     def fetch_latest(self, limit: int = 1) -> List[NetflixTechBlogItem]:
         last_error: Optional[Exception] = None
         for url in self._candidate_feed_urls():
             logging.debug("Fetching Netflix Tech Blog RSS from %s", url)
             try:
-                resp = self.session.get(url, timeout=self.timeout, verify=self.verify)
-                resp.raise_for_status()
-                root = ET.fromstring(resp.content)
-                return self._parse_items(root, limit=limit)
+                return self._fetch_items(url, verify=self.verify, limit=limit)
             except requests_exceptions.SSLError as exc:
                 last_error = exc
                 if self.allow_insecure_fallback:
@@ -152,21 +282,21 @@ class NetflixTechBlogRSSClient:
                         "SSL verification failed fetching %s; retrying with verify=False (INSECURE).",
                         url,
                     )
-                    resp = self.session.get(url, timeout=self.timeout, verify=False)
-                    resp.raise_for_status()
-                    root = ET.fromstring(resp.content)
-                    return self._parse_items(root, limit=limit)
+                    return self._fetch_items(url, verify=False, limit=limit)
                 if self.allow_curl_fallback:
                     logging.warning(
-                        "SSL verification failed fetching %s; retrying via system curl.",
+                        "SSL verification failed fetching %s; retrying with the system trust store.",
                         url,
                     )
-                    content = self._fetch_via_curl() if url == self.feed_url else self._fetch_via_curl_url(url)
-                    root = ET.fromstring(content)
-                    return self._parse_items(root, limit=limit)
+                    return self._parse_items(self._fetch_with_system_trust(url), limit=limit)
                 logging.warning("SSL verification failed fetching %s; trying next feed URL.", url)
                 continue
-            except (requests_exceptions.RequestException, ET.ParseError, RuntimeError) as exc:
+            except (
+                requests_exceptions.RequestException,
+                urllib3.exceptions.HTTPError,
+                ET.ParseError,
+                RuntimeError,
+            ) as exc:
                 last_error = exc
                 logging.warning("Failed fetching/parsing %s; trying next feed URL. (%s)", url, type(exc).__name__)
                 continue
@@ -175,57 +305,78 @@ class NetflixTechBlogRSSClient:
             f"Unable to fetch Netflix Tech Blog RSS from any configured URL: {self._candidate_feed_urls()}"
         ) from last_error
 
-    def _fetch_via_curl_url(self, url: str) -> bytes:
-        timeout = max(1, int(self.timeout))
-        cmd = [
-            "curl",
-            "-fsSL",
-            "--max-time",
-            str(timeout),
-            url,
-        ]
-        result = subprocess.run(cmd, check=False, capture_output=True)
-        if result.returncode != 0:
-            stderr = (result.stderr or b"").decode("utf-8", errors="replace")
-            raise RuntimeError(f"curl failed fetching {url}: {stderr[:500]}")
-        return result.stdout
-
-    def _parse_items(self, root: ET.Element, *, limit: int) -> List[NetflixTechBlogItem]:
-        channel = root.find("channel")
-        if channel is None:
-            raise ValueError("Invalid RSS feed: missing channel element")
-
+    def _parse_items(
+        self, content: Union[bytes, Iterable[bytes]], *, limit: int
+    ) -> List[NetflixTechBlogItem]:
         items: List[NetflixTechBlogItem] = []
-        for item in channel.findall("item"):
+        channel: Optional[ET.Element] = None
+        in_channel = False
+        # Depth of open elements, so only the channel's direct <item> children are read.
+        depth = channel_depth = 0
+        # Items without a usable pubDate share one fallback timestamp per parse.
+        now = datetime.now(timezone.utc)
+        # Stream the feed: items are dropped once read and parsing stops at `limit`.
+        chunks = (content,) if isinstance(content, bytes) else content
+        for event, item in _iter_xml_events(chunks):
+            if event == "start":
+                depth += 1
+                if channel is None and item.tag == "channel":
+                    channel, in_channel, channel_depth = item, True, depth
+                continue
+            depth -= 1
+            if item is channel:
+                in_channel = False
+                continue
+            if item.tag != "item":
+                continue
+            if channel is None:
+                raise ValueError("Invalid RSS feed: missing channel element")
+            if not in_channel or depth != channel_depth:
+                continue
             title = (item.findtext("title") or "").strip()
             link = (item.findtext("link") or "").strip()
-            pub_date = self._parse_datetime(item.findtext("pubDate"))
+            # Skipped items need nothing else, and the description only backs up
+            # an empty content:encoded.
+            if title and link:
+                pub_date_text = item.findtext("pubDate")
+                raw_html = (
+                    item.findtext(self.CONTENT_ENCODED_TAG) or item.findtext("description") or ""
+                ).strip()
+            else:
+                pub_date_text = raw_html = ""
+            item.clear()
+            # Detach the read item as well, so the channel never accumulates empty shells.
+            # Earlier items are already gone, so the search only passes channel metadata.
+            channel.remove(item)
+            if not title or not link:
+                continue
 
-            content_html = item.findtext("content:encoded", namespaces=self.CONTENT_NAMESPACES)
-            description_html = item.findtext("description")
-            raw_html = (content_html or description_html or "").strip()
-            content = self._html_to_text(raw_html) if raw_html else ""
+            pub_date = self._parse_datetime(pub_date_text, now)
+            # Only the head of the article survives truncation, so only parse its markup.
+            html_budget = self.max_chars * HTML_TEXT_HEADROOM if self.max_chars else 0
+            clipped = bool(html_budget) and len(raw_html) > html_budget
+            if clipped:
+                raw_html = raw_html[:html_budget]
+            text = self._html_to_text(raw_html, self.max_chars) if raw_html else ""
 
-            if self.max_chars and len(content) > self.max_chars:
+            if self.max_chars and (clipped or len(text) > self.max_chars):
                 logging.info(
-                    "Netflix article content truncated from %s to %s characters.",
-                    len(content),
-                    self.max_chars,
+                    "Netflix article content truncated to %s characters.", self.max_chars
                 )
-                content = content[: self.max_chars].rstrip() + "\n\n...(truncated)"
-
-            if not title or not link:
-                continue
+                text = text[: self.max_chars].rstrip() + "\n\n...(truncated)"
 
             items.append(
                 NetflixTechBlogItem(
                     title=title,
                     link=link,
                     published_at=pub_date,
-                    content=content,
+                    content=text,
                 )
             )
             if len(items) >= limit:
                 break
 
+        # The channel is recorded at its start tag, so an early stop still counts it.
+        if channel is None:
+            raise ValueError("Invalid RSS feed: missing channel element")
         return items
@@ -3,12 +3,14 @@ from __future__ import annotations
 import logging
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from email.utils import parsedate_to_datetime
-from typing import List, Optional
-from xml.etree import ElementTree as ET
+from itertools import islice
+from typing import Iterator, List, Optional
 
 import requests
 
+from feeds import iter_channel_items, parse_pubdate, to_expat_bytes
+from http_utils import get_shared_session
+
 
 @dataclass
 class JapaneseNewsItem:
@@ -26,52 +28,34 @@ class JapaneseRSSClient:
 
     def __init__(self, feed_url: str, session: Optional[requests.Session] = None, timeout: int = 10):
         self.feed_url = feed_url
-        self.session = session or requests.Session()
+        self.session = session or get_shared_session()
         self.timeout = timeout
 
-    def _parse_datetime(self, value: Optional[str]) -> datetime:
-        if not value:
-            return datetime.now(timezone.utc)
-        try:
-            dt = parsedate_to_datetime(value)
-            if dt.tzinfo is None:
-                dt = dt.replace(tzinfo=timezone.utc)
-            return dt
-        except (TypeError, ValueError):
-            logging.debug("Unable to parse pubDate '%s'", value)
-            return datetime.now(timezone.utc)
-
-    def fetch_items(self, limit: int = 1) -> List[JapaneseNewsItem]:
-        logging.debug("Fetching Japanese RSS feed from %s", self.feed_url)
-        resp = self.session.get(self.feed_url, timeout=self.timeout)
-        resp.raise_for_status()
-
-        root = ET.fromstring(resp.content)
-        channel = root.find("channel")
-        if channel is None:
-            raise ValueError("Invalid RSS feed: missing channel element")
-
-        items: List[JapaneseNewsItem] = []
-        for item in channel.findall("item"):
-            title = (item.findtext("title") or "").strip()
-            description = (item.findtext("description") or "").strip()
-            link = (item.findtext("link") or "").strip()
-            pub_date_raw = item.findtext("pubDate")
-            pub_date = self._parse_datetime(pub_date_raw)
-
+    def _parse_datetime(self, value: Optional[str], default: Optional[datetime] = None) -> datetime:
+        return parse_pubdate(value, default)
+
+    def _iter_items(self, content: bytes) -> Iterator[JapaneseNewsItem]:
+        """Stream complete items in feed order, clearing each element once read."""
+        # Items without a usable pubDate share one fallback timestamp per parse.
+        now = datetime.now(timezone.utc)
+        # Japanese feeds may declare Shift_JIS or EUC-JP; forcing UTF-8 would garble them.
+        for elem in iter_channel_items(to_expat_bytes(content)):
+            title = (elem.findtext("title") or "").strip()
+            description = (elem.findtext("description") or "").strip()
             if not title or not description:
                 continue
-
-            news_item = JapaneseNewsItem(
+            yield JapaneseNewsItem(
                 title=title,
-                link=link,
-                published_at=pub_date,
+                link=(elem.findtext("link") or "").strip(),
+                published_at=self._parse_datetime(elem.findtext("pubDate"), now),
                 content=description,
             )
-            items.append(news_item)
-            if len(items) >= limit:
-                break
-        return items
+
+    def fetch_items(self, limit: int = 1) -> List[JapaneseNewsItem]:
+        logging.debug("Fetching Japanese RSS feed from %s", self.feed_url)
+        resp = self.session.get(self.feed_url, timeout=self.timeout)
+        resp.raise_for_status()
+        return list(islice(self._iter_items(resp.content), limit))
 
     def build_prompt(self, items: List[JapaneseNewsItem]) -> str:
         if not items:
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+import pytest
+
+from ars_client import KEYWORDS, ArsArticle, ArsTechnicaRSSClient, _KEYWORD_RE, _trie_pattern
+
+
+@dataclass
+class _FakeResponse:
+    content: bytes
+    status_code: int = 200
+    headers: Dict[str, str] = field(default_factory=dict)
+
+    def raise_for_status(self) -> None:
+        return
+
+
+class _FakeSession:
+    def __init__(self, content: bytes, headers: Optional[Dict[str, str]] = None):
+        self._content = content
+        self._headers = headers or {}
+        self.calls = []
+
+    def get(self, url: str, headers=None, timeout: int = 10):  # noqa: ANN001
+        self.calls.append({"url": url, "headers": headers or {}, "timeout": timeout})
+        if headers and headers.get("If-None-Match") == self._headers.get("ETag"):
+            return _FakeResponse(content=b"", status_code=304)
+        return _FakeResponse(content=self._content, headers=self._headers)
+
+
+def _rss(*items: str) -> bytes:
+    body = "".join(items)
+    return f"""<?xml version='1.0' encoding='UTF-8'?>
+<rss version='2.0'>
+  <channel>
+    <title>Ars Technica</title>
+    {body}
+  </channel>
+</rss>
+""".encode("utf-8")
+
+
+def _item(title: str, description: str = "Summary") -> str:
+    return (
+        f"<item><title>{title}</title><link>https://arstechnica.com/{title}</link>"
+        f"<description>{description}</description></item>"
+    )
+
+
+def test_fetch_articles_skips_incomplete_items_and_respects_limit():
+    rss = _rss(_item("First"), _item("Untitled", description=""), _item("Second"), _item("Third"))
+    client = ArsTechnicaRSSClient(session=_FakeSession(rss))
+    articles = client.fetch_articles(limit=2)
+    assert [article.title for article in articles] == ["First", "Second"]
+    assert articles[0].link == "https://arstechnica.com/First"
+    assert articles[0].summary == "Summary"
+
+
+def test_fetch_articles_accepts_empty_channel():
+    client = ArsTechnicaRSSClient(session=_FakeSession(_rss()))
+    assert client.fetch_articles() == []
+
+
+def test_fetch_articles_requires_channel():
+    rss = b"<rss version='2.0'><item><title>x</title></item></rss>"
+    client = ArsTechnicaRSSClient(session=_FakeSession(rss))
+    with pytest.raises(ValueError):
+        client.fetch_articles()
+
+
+def test_fetch_articles_reuses_cache_when_not_modified(tmp_path):
+    session = _FakeSession(_rss(_item("First"), _item("Second")), headers={"ETag": '"v1"'})
+    cache_path = tmp_path / "ars_feed.json"
+    client = ArsTechnicaRSSClient(session=session, cache_path=cache_path)
+    first = client.fetch_articles(limit=2)
+    assert cache_path.exists()
+
+    second = ArsTechnicaRSSClient(session=session, cache_path=cache_path).fetch_articles(limit=2)
+    assert session.calls[0]["headers"] == {}
+    assert session.calls[1]["headers"] == {"If-None-Match": '"v1"'}
+    assert second == first
+
+
+def test_fetch_articles_skips_cache_for_different_query(tmp_path):
+    session = _FakeSession(_rss(_item("First"), _item("Second")), headers={"ETag": '"v1"'})
+    cache_path = tmp_path / "ars_feed.json"
+    ArsTechnicaRSSClient(session=session, cache_path=cache_path).fetch_articles(limit=1)
+    articles = ArsTechnicaRSSClient(session=session, cache_path=cache_path).fetch_articles(limit=2)
+    assert session.calls[1]["headers"] == {}
+    assert len(articles) == 2
+
+
+def test_fetch_relevant_articles_stops_after_desired_matches():
+    rss = _rss(_item("Rockets"), _item("Python tips"), _item("LLM news"), _item("AI chips"))
+    articles = ArsTechnicaRSSClient(session=_FakeSession(rss)).fetch_relevant_articles(
+        limit=10, desired=2
+    )
+    assert [article.title for article in articles] == ["Python tips", "LLM news"]
+
+
+def test_fetch_relevant_articles_falls_back_to_latest_items():
+    rss = _rss(_item("Rockets"), _item("Mars"), _item("Moon"))
+    articles = ArsTechnicaRSSClient(session=_FakeSession(rss)).fetch_relevant_articles(
+        limit=10, desired=2
+    )
+    assert [article.title for article in articles] == ["Rockets", "Mars"]
+
+
+def test_fetch_relevant_articles_only_considers_first_limit_items():
+    rss = _rss(_item("Rockets"), _item("Mars"), _item("Python tips"))
+    articles = ArsTechnicaRSSClient(session=_FakeSession(rss)).fetch_relevant_articles(
+        limit=2, desired=2
+    )
+    assert [article.title for article in articles] == ["Rockets", "Mars"]
+
+
+def test_trie_pattern_factors_shared_prefixes():
+    assert _trie_pattern(["ml", "machine"]) == "m(?:achine|l)"
+    assert _trie_pattern(["ai", "aist"]) == "ai"
+
+
+def test_keyword_regex_matches_plain_substring_scan():
+    samples = ["He said so", "HTML tips", "LLMs", "Rust release", "An Algorithmic view", ""]
+    for text in samples:
+        expected = any(keyword in text.lower() for keyword in KEYWORDS)
+        assert (_KEYWORD_RE.search(text) is not None) is expected
+
+
+def test_is_relevant_is_case_insensitive():
+    client = ArsTechnicaRSSClient(session=object())  # type: ignore[arg-type]
+    article = ArsArticle(title="New Python release", link="", summary="Details inside")
+    assert client._is_relevant(article)
+    article = ArsArticle(title="Machine Learning at scale", link="", summary="")
+    assert client._is_relevant(article)
+    article = ArsArticle(title="Rocket launch", link="", summary="Orbit reached")
+    assert not client._is_relevant(article)
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+import pytest
+import requests
+
+from daily_task import RunConfig, _run_japanese_chain, build_japanese_section, build_netflix_client
+from http_utils import SSLContextAdapter, create_session
+from rss_client import JapaneseNewsItem
+
+
+def _news_item(link: str = "https://www3.nhk.or.jp/news/1.html") -> JapaneseNewsItem:
+    return JapaneseNewsItem(
+        title="見出し",
+        link=link,
+        published_at=datetime(2026, 1, 5, tzinfo=timezone.utc),
+        content="本文です。",
+    )
+
+
+def test_build_japanese_section_formats_all_parts():
+    data = {
+        "news_romaji": "honbun desu.",
+        "translation": " 这是正文。 ",
+        "vocabulary": [
+            {"word": "本文", "romaji": "honbun", "part_of_speech": "名词", "meaning_zh": "正文"},
+            {"word": "です", "part_of_speech": "助动词", "meaning_zh": "是"},
+        ],
+        "grammar": [{"title": "〜です", "description": "礼貌判断"}],
+    }
+    sections = build_japanese_section([_news_item()], data)
+    assert sections["news"] == (
+        "- **見出し**\n  本文です。\n  ローマ音: honbun desu.\n"
+        "  [原文链接](https://www3.nhk.or.jp/news/1.html)"
+    )
+    assert sections["translation"] == "这是正文。"
+    assert sections["vocabulary"] == (
+        "- **本文 (honbun)** (名词): 正文\n- **です** (助动词): 是"
+    )
+    assert sections["grammar"] == "- **〜です**: 礼貌判断"
+
+
+def test_build_japanese_section_uses_placeholders_when_empty():
+    sections = build_japanese_section([], {"vocabulary": None})
+    assert sections["news"] == "暂无新闻抓取。"
+    assert sections["vocabulary"] == "暂无词汇整理。"
+    assert sections["grammar"] == "暂无语法说明。"
+
+
+class _FakeRSSClient:
+    def __init__(self, items):  # noqa: ANN001
+        self._items = items
+
+    def fetch_items(self, limit: int = 5):  # noqa: ANN201
+        return self._items[:limit]
+
+    def build_prompt(self, items):  # noqa: ANN001, ANN201
+        return "\n".join(item.title for item in items)
+
+
+def test_run_japanese_chain_generates_from_selected_item(monkeypatch):
+    prompts = []
+    monkeypatch.setattr(
+        "daily_task.generate_japanese_learning",
+        lambda client, prompt: prompts.append(prompt) or {"translation": "t"},
+    )
+    item, data = _run_japanese_chain(_FakeRSSClient([_news_item()]), llm_client=None)
+    assert item.title == "見出し"
+    assert prompts == ["見出し"]
+    assert data == {"translation": "t"}
+
+
+def test_run_japanese_chain_fails_before_calling_llm(monkeypatch):
+    monkeypatch.setattr("daily_task.generate_japanese_learning", pytest.fail)
+    with pytest.raises(RuntimeError):
+        _run_japanese_chain(_FakeRSSClient([]), llm_client=None)
+
+
+def _run_config(**overrides) -> RunConfig:
+    config = {
+        "openai_api_key": "sk-test",
+        "lark_folder_token": "folder",
+        "japanese_rss_url": "https://www3.nhk.or.jp/rss/news/cat0.xml",
+        "cache_dir": "/tmp/daily_task_test_cache",
+    }
+    config.update(overrides)
+    return RunConfig.from_config(config)
+
+
+def test_build_netflix_client_uses_ssl_context_session_for_ca_bundle():
+    shared = create_session()
+    client = build_netflix_client(
+        _run_config(netflix_ca_bundle=requests.certs.where()), shared
+    )
+
+    assert client.session is not shared
+    assert isinstance(client.session.get_adapter(client.feed_url), SSLContextAdapter)
+    assert client.verify is True
+
+
+def test_build_netflix_client_reuses_shared_session_without_ca_bundle():
+    shared = create_session()
+    client = build_netflix_client(_run_config(), shared)
+
+    assert client.session is shared
+    assert client.verify is True
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import threading
+from datetime import datetime, timedelta, timezone
+from xml.etree import ElementTree as ET
+
+import pytest
+
+from feeds import _parse_rfc2822, fetch_many, iter_channel_items, parse_pubdate, to_expat_bytes
+
+
+def test_fetch_many_runs_jobs_concurrently_and_keeps_order():
+    barrier = threading.Barrier(3, timeout=5)
+
+    def job(value):  # noqa: ANN001, ANN202
+        barrier.wait()  # only returns once all three jobs are running at the same time
+        return value
+
+    assert fetch_many([lambda: job("a"), lambda: job("b"), lambda: job("c")]) == ["a", "b", "c"]
+
+
+def test_fetch_many_reraises_first_failure_in_input_order():
+    def fail(message):  # noqa: ANN001, ANN202
+        raise RuntimeError(message)
+
+    with pytest.raises(RuntimeError, match="first"):
+        fetch_many([lambda: "ok", lambda: fail("first"), lambda: fail("second")])
+    assert fetch_many([]) == []
+
+
+def test_parse_pubdate_memoizes_only_successful_parses():
+    _parse_rfc2822.cache_clear()
+    first = parse_pubdate("Mon, 05 Jan 2026 09:00:00 +0900")
+    assert parse_pubdate("Mon, 05 Jan 2026 09:00:00 +0900") is first
+    assert first == datetime(2026, 1, 5, tzinfo=timezone.utc)
+    assert parse_pubdate("Mon, 05 Jan 2026 00:00:00").tzinfo is timezone.utc
+
+    before = datetime.now(timezone.utc)
+    assert parse_pubdate("not a date") >= before
+    assert parse_pubdate(None) - before < timedelta(seconds=5)
+    assert _parse_rfc2822.cache_info().currsize == 2
+
+    fallback = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    assert parse_pubdate(None, fallback) is fallback
+    assert parse_pubdate("not a date", fallback) is fallback
+    assert parse_pubdate("Mon, 05 Jan 2026 09:00:00 +0900", fallback) is first
+
+
+def test_to_expat_bytes_passes_native_encodings_through():
+    utf8 = "<?xml version='1.0' encoding='UTF-8'?><rss>日本</rss>".encode("utf-8")
+    assert to_expat_bytes(utf8) is utf8
+    undeclared = b"<rss/>"
+    assert to_expat_bytes(undeclared) is undeclared
+    euc = '<?xml version="1.0" encoding="EUC-JP"?><rss>日本</rss>'.encode("euc_jp")
+    assert to_expat_bytes(euc) == '<?xml version="1.0" encoding="utf-8"?><rss>日本</rss>'.encode()
+
+    for single_byte in ("windows-1252", "ISO-8859-15", "koi8-r"):
+        feed = f"<?xml version='1.0' encoding='{single_byte}'?><rss>é</rss>".encode(
+            single_byte, errors="replace"
+        )
+        assert to_expat_bytes(feed) is feed
+        ET.fromstring(feed)  # expat decodes single-byte codecs itself
+    sjis = "<?xml version='1.0' encoding='Shift_JIS'?><rss>日本</rss>".encode("shift_jis")
+    assert ET.fromstring(to_expat_bytes(sjis)).text == "日本"
+
+
+def test_iter_channel_items_checks_channel_even_when_stopped_early():
+    feed = b"<rss><channel><item><title>a</title></item><item><title>b</title></item></channel></rss>"
+    items = iter_channel_items(feed)
+    assert next(items).findtext("title") == "a"
+
+    stray = iter_channel_items(b"<rss><item><title>a</title></item><channel/></rss>")
+    with pytest.raises(ValueError):
+        next(stray)
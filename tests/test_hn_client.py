@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+import requests
+
+from hn_client import (
+    HN_ALGOLIA_FRONT_PAGE_URL,
+    HN_ITEM_URL,
+    HN_TOP_STORIES_URL,
+    HackerNewsClient,
+)
+
+
+@dataclass
+class _FakeResponse:
+    content: bytes
+    status_code: int = 200
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"HTTP {self.status_code}")
+
+
+class _FakeSession:
+    def __init__(
+        self,
+        payloads: Dict[str, Any],
+        before_get: Optional[Callable[[str], None]] = None,
+    ):
+        self._payloads = payloads
+        self._before_get = before_get
+        self._lock = threading.Lock()
+        self.calls = []
+
+    def get(self, url: str, params=None, timeout: int = 10):  # noqa: ANN001
+        with self._lock:
+            self.calls.append({"url": url, "params": params})
+        if self._before_get:
+            self._before_get(url)
+        payload = self._payloads.get(url)
+        if isinstance(payload, _FakeResponse):
+            return payload
+        if payload is None and url not in self._payloads:
+            return _FakeResponse(content=b"", status_code=404)
+        return _FakeResponse(content=json.dumps(payload).encode("utf-8"))
+
+
+def _story(story_id: int, **fields: Any) -> Dict[str, Any]:
+    return {"id": story_id, "type": "story", "title": f"Story {story_id}", **fields}
+
+
+def _firebase(ids, stories: Dict[int, Any]) -> Dict[str, Any]:  # noqa: ANN001
+    payloads: Dict[str, Any] = {HN_TOP_STORIES_URL: list(ids)}
+    for story_id, story in stories.items():
+        payloads[HN_ITEM_URL.format(story_id=story_id)] = story
+    return payloads
+
+
+def test_fetch_top_stories_keeps_ranking_order_when_later_ids_finish_first():
+    later_done = threading.Event()
+
+    def before_get(url: str) -> None:
+        if url == HN_ITEM_URL.format(story_id=1):
+            # The top-ranked story only completes once a later one already has.
+            later_done.wait(timeout=5)
+        elif url == HN_ITEM_URL.format(story_id=3):
+            later_done.set()
+
+    session = _FakeSession(_firebase([1, 2, 3], {i: _story(i) for i in (1, 2, 3)}), before_get)
+    stories = HackerNewsClient(session=session, max_workers=3).fetch_top_stories(desired=3)
+    assert [story.id for story in stories] == [1, 2, 3]
+
+
+def test_fetch_top_stories_skips_invalid_and_missing_stories():
+    stories = {
+        1: {"id": 1, "type": "comment", "text": "not a story"},
+        2: None,
+        3: _story(3, title=""),
+        5: _story(5, url="https://example.com/5"),
+        6: _story(6),
+    }
+    payloads = _firebase([1, 2, 3, 4, 5, 6], stories)
+    payloads[HN_ITEM_URL.format(story_id=4)] = _FakeResponse(content=b"", status_code=500)
+    client = HackerNewsClient(session=_FakeSession(payloads))
+    result = client.fetch_top_stories(desired=2)
+    assert [story.id for story in result] == [5, 6]
+    assert result[0].url == "https://example.com/5"
+
+
+def test_fetch_top_stories_cancels_queued_fetches_once_desired_arrive():
+    ids = list(range(1, 41))
+    def before_get(url: str) -> None:
+        if url not in (HN_TOP_STORIES_URL, *(HN_ITEM_URL.format(story_id=i) for i in (1, 2))):
+            # Keep the worker busy so the queued fetches are still pending at the cutoff.
+            time.sleep(0.5)
+
+    session = _FakeSession(_firebase(ids, {i: _story(i) for i in ids}), before_get)
+    stories = HackerNewsClient(session=session, max_workers=1).fetch_top_stories(desired=2)
+    assert [story.id for story in stories] == [1, 2]
+    item_calls = [call for call in session.calls if call["url"] != HN_TOP_STORIES_URL]
+    # Only the fetch a worker had already started may run past the cutoff.
+    assert len(item_calls) <= 3
+
+
+def test_fetch_top_stories_batched_uses_one_algolia_call():
+    hits = [
+        {"objectID": "11", "title": "First", "url": "https://example.com/11"},
+        None,
+        "not a hit",
+        {"objectID": "abc", "title": "Bad id"},
+        {"objectID": "12", "title": ""},
+        {"objectID": "13", "title": "Second", "story_text": "Ask HN body"},
+        {"objectID": "14", "title": "Third"},
+    ]
+    session = _FakeSession({HN_ALGOLIA_FRONT_PAGE_URL: {"hits": hits}})
+    stories = HackerNewsClient(session=session).fetch_top_stories_batched(desired=2)
+    assert [(story.id, story.title) for story in stories] == [(11, "First"), (13, "Second")]
+    assert stories[0].url == "https://example.com/11"
+    assert stories[1].text == "Ask HN body"
+    assert [call["url"] for call in session.calls] == [HN_ALGOLIA_FRONT_PAGE_URL]
+    assert session.calls[0]["params"]["tags"] == "front_page"
+
+
+def test_fetch_top_stories_batched_falls_back_to_firebase_on_http_error():
+    payloads = _firebase([1], {1: _story(1)})
+    payloads[HN_ALGOLIA_FRONT_PAGE_URL] = _FakeResponse(content=b"", status_code=503)
+    stories = HackerNewsClient(session=_FakeSession(payloads)).fetch_top_stories_batched(desired=1)
+    assert [story.id for story in stories] == [1]
+
+
+def test_fetch_top_stories_batched_falls_back_to_firebase_on_bad_payload():
+    for bad in ({"hits": None}, ["not", "a", "dict"]):
+        payloads = _firebase([2], {2: _story(2)})
+        payloads[HN_ALGOLIA_FRONT_PAGE_URL] = bad
+        client = HackerNewsClient(session=_FakeSession(payloads))
+        assert [story.id for story in client.fetch_top_stories_batched(desired=1)] == [2]
+
+    payloads = _firebase([3], {3: _story(3)})
+    payloads[HN_ALGOLIA_FRONT_PAGE_URL] = _FakeResponse(content=b"{not json")
+    client = HackerNewsClient(session=_FakeSession(payloads))
+    assert [story.id for story in client.fetch_top_stories_batched(desired=1)] == [3]
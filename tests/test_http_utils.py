@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import ssl
+
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+
+from http_utils import (
+    SSLContextAdapter,
+    create_session,
+    get_shared_session,
+    get_system_trust_pool,
+)
+from netflix_client import NetflixTechBlogRSSClient
+from rss_client import JapaneseRSSClient
+
+
+def test_create_session_mounts_pooled_retrying_adapter():
+    session = create_session(pool_maxsize=5, total_retries=2)
+    adapter = session.get_adapter("https://example.com")
+    assert adapter._pool_maxsize == 5
+    assert adapter.max_retries.total == 2
+    assert session.get_adapter("http://example.com") is adapter
+
+
+def test_feed_clients_default_to_one_shared_session():
+    shared = get_shared_session()
+    assert get_shared_session() is shared
+    assert NetflixTechBlogRSSClient().session is shared
+    assert JapaneseRSSClient("https://example.jp/rss").session is shared
+
+
+def test_system_trust_pool_is_shared_and_verifies():
+    pool = get_system_trust_pool()
+    assert get_system_trust_pool() is pool
+    context = pool.connection_pool_kw["ssl_context"]
+    assert context.verify_mode == ssl.CERT_REQUIRED
+    assert context.check_hostname
+
+
+def test_ssl_context_session_verifies_with_its_context_only():
+    context = ssl.create_default_context()
+    adapter = create_session(ssl_context=context).get_adapter("https://example.com")
+    assert isinstance(adapter, SSLContextAdapter)
+    url = "https://example.com/feed"
+    request = requests.Request("GET", url).prepare()
+    # The same calls HTTPAdapter.send makes; REQUESTS_CA_BUNDLE may turn True into a path.
+    for verify in (True, requests.certs.where()):
+        pool = adapter.get_connection_with_tls_context(request, verify)
+        adapter.cert_verify(pool, url, verify, None)
+        assert pool.conn_kw["ssl_context"] is context
+        assert pool.ca_certs is None and pool.ca_cert_dir is None
+    unverified = adapter.get_connection_with_tls_context(request, False)
+    assert "ssl_context" not in unverified.conn_kw
+    assert unverified is not pool
+
+
+def test_ssl_context_session_refuses_requests_without_pool_key_hook(monkeypatch):
+    monkeypatch.delattr(HTTPAdapter, "build_connection_pool_key_attributes")
+    with pytest.raises(RuntimeError, match="2.32.3"):
+        create_session(ssl_context=ssl.create_default_context())
+    client = NetflixTechBlogRSSClient(ca_bundle=requests.certs.where())
+    assert client.session is get_shared_session()
+    assert client.verify == requests.certs.where()
+
+
+def test_netflix_ca_bundle_gets_dedicated_context_session():
+    bundle = requests.certs.where()
+    client = NetflixTechBlogRSSClient(ca_bundle=bundle)
+    assert client.session is not get_shared_session()
+    assert isinstance(client.session.get_adapter(client.feed_url), SSLContextAdapter)
+    assert client.verify is True
+
+    missing = NetflixTechBlogRSSClient(ca_bundle="/nonexistent/bundle.pem")
+    assert missing.session is get_shared_session()
+    assert missing.verify == "/nonexistent/bundle.pem"
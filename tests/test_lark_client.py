@@ -1,5 +1,14 @@
+import json
+from types import SimpleNamespace
+
+import lark_oapi as lark
+import pytest
+from lark_oapi.api.docx.v1 import model as docx_models
+
 from lark_client import (
     MAX_DOC_TOKEN_LEN,
+    LarkClient,
+    _build_block_object,
     _split_inline_code_spans,
     _extract_doc_token,
     _markdown_to_blocks,
@@ -41,6 +50,24 @@ Plain text line"""
     assert blocks[3]["text"] == "Plain text line"
 
 
+def test_markdown_to_blocks_breaks_lines_only_on_newlines():
+    blocks = _markdown_to_blocks("- one\u2028two\x0cthree\x85four\r\n- five\rsix")
+    assert [(block["block_type"], block["text"]) for block in blocks] == [
+        ("bulleted", "one\u2028two\x0cthree\x85four"),
+        ("bulleted", "five"),
+        ("paragraph", "six"),
+    ]
+
+
+def test_markdown_heading_levels_are_capped_at_six():
+    blocks = _markdown_to_blocks("####### Deep\n#\n##Tight")
+    assert [(b["block_type"], b["text"]) for b in blocks] == [
+        ("heading6", "# Deep"),
+        ("heading1", " "),
+        ("heading2", "Tight"),
+    ]
+
+
 def test_markdown_bullet_continuation_lines_merge():
     markdown = "- word\n  definition line\n  例句: sample"
     blocks = _markdown_to_blocks(markdown)
@@ -76,3 +103,195 @@ def test_split_inline_code_spans():
 def test_split_inline_code_spans_ignores_unclosed_backtick():
     spans = _split_inline_code_spans("a `b c")
     assert spans == [("a `b c", False)]
+
+
+def test_split_inline_code_spans_plain_and_empty_spans():
+    assert _split_inline_code_spans("plain") == [("plain", False)]
+    assert _split_inline_code_spans("``") == [("``", False)]
+    assert _split_inline_code_spans("`x``y`") == [("x", True), ("y", True)]
+
+
+def test_build_block_object_matches_sdk_builders():
+    style = docx_models.TextElementStyle.builder().inline_code(True).build()
+    elements = [
+        docx_models.TextElement.builder()
+        .text_run(docx_models.TextRun.builder().content("run ").build())
+        .build(),
+        docx_models.TextElement.builder()
+        .text_run(
+            docx_models.TextRun.builder().content("code").text_element_style(style).build()
+        )
+        .build(),
+    ]
+    text_obj = docx_models.Text.builder().elements(elements).build()
+    expected = docx_models.Block.builder().block_type(5).heading3(text_obj).build()
+
+    block = _build_block_object({"block_type": "heading3", "text": "run `code`"})
+    assert lark.JSON.marshal(block) == lark.JSON.marshal(expected)
+
+
+class _FakeBlockChildren:
+    def __init__(self):
+        self.requests = []
+
+    def create(self, request):  # noqa: ANN001
+        self.requests.append(request)
+        return SimpleNamespace(success=lambda: True)
+
+
+def test_ensure_response_logs_decoded_prefix_of_error_body(caplog):
+    response = SimpleNamespace(
+        success=lambda: False,
+        raw=SimpleNamespace(content=("错误" + "x" * 2000).encode("utf-8") + b"\xff"),
+        code=99991663,
+        msg="invalid token",
+        get_log_id=lambda: "log_1",
+    )
+    with pytest.raises(RuntimeError, match="invalid token"):
+        LarkClient._ensure_response(response, "list files")
+    logged = caplog.records[-1].getMessage()
+    assert "raw=错误" in logged
+    assert logged.endswith("x" * 494 + ")")
+
+
+def test_prepend_content_inserts_blocks_in_one_call():
+    block_children = _FakeBlockChildren()
+    client = LarkClient(app_id="cli_x", app_secret="secret", root_folder_token="fld")
+    client.client = SimpleNamespace(
+        docx=SimpleNamespace(v1=SimpleNamespace(document_block_children=block_children))
+    )
+    token = "D" * MAX_DOC_TOKEN_LEN
+    client.prepend_content(token, "## Title\n- item")
+    assert len(block_children.requests) == 1
+    request = block_children.requests[0]
+    assert request.request_body.index == 0
+    assert [block.block_type for block in request.request_body.children] == [4, 12]
+
+
+def test_ensure_document_caches_token_per_folder(tmp_path, monkeypatch):
+    cache_path = tmp_path / "lark_docs.json"
+    lookups = []
+
+    def fake_find(self, title):  # noqa: ANN001
+        lookups.append(title)
+        return "doc_token"
+
+    monkeypatch.setattr(LarkClient, "find_document_by_title", fake_find)
+    first = LarkClient("cli_x", "secret", "fld_a", cache_path=cache_path)
+    assert first.ensure_document("Daily 2026-01") == "doc_token"
+    second = LarkClient("cli_x", "secret", "fld_a", cache_path=cache_path)
+    assert second.ensure_document("Daily 2026-01") == "doc_token"
+    assert lookups == ["Daily 2026-01"]
+
+    other_folder = LarkClient("cli_x", "secret", "fld_b", cache_path=cache_path)
+    other_folder.ensure_document("Daily 2026-01")
+    assert lookups == ["Daily 2026-01", "Daily 2026-01"]
+
+
+class _FakeFileApi:
+    def __init__(self, pages):
+        self._pages = pages
+        self.requests = []
+
+    def list(self, request):  # noqa: ANN001
+        self.requests.append(request)
+        files, next_token = self._pages[len(self.requests) - 1]
+        data = SimpleNamespace(files=files, next_page_token=next_token, has_more=bool(next_token))
+        return SimpleNamespace(success=lambda: True, data=data)
+
+
+def _drive_file(name: str, token: str, file_type: str = "docx"):
+    return SimpleNamespace(name=name, token=token, type=file_type, url=None)
+
+
+def _client_with_files(pages):
+    file_api = _FakeFileApi(pages)
+    client = LarkClient(app_id="cli_x", app_secret="secret", root_folder_token="fld")
+    client.client = SimpleNamespace(drive=SimpleNamespace(v1=SimpleNamespace(file=file_api)))
+    return client, file_api
+
+
+def test_find_document_by_title_follows_pagination():
+    client, file_api = _client_with_files(
+        [
+            ([_drive_file("Other", "tok_other")], "page2"),
+            ([_drive_file("Target", "tok_legacy", file_type="doc"), _drive_file("Target", "tok_docx")], None),
+        ]
+    )
+    assert client.find_document_by_title("Target") == "tok_docx"
+    assert len(file_api.requests) == 2
+    assert ("page_token", "page2") in file_api.requests[1].queries
+
+
+def test_find_document_by_title_stops_at_first_match():
+    client, file_api = _client_with_files(
+        [([_drive_file("Target", "tok_docx")], "page2"), ([], None)]
+    )
+    assert client.find_document_by_title("Target") == "tok_docx"
+    assert len(file_api.requests) == 1
+
+
+def test_find_document_by_title_reuses_listing_across_lookups():
+    client, file_api = _client_with_files(
+        [
+            ([_drive_file("Newest", "tok_new"), _drive_file("Target", "tok_docx")], "page2"),
+            ([_drive_file("Oldest", "tok_old")], None),
+        ]
+    )
+    assert client.find_document_by_title("Target") == "tok_docx"
+    assert client.find_document_by_title("Newest") == "tok_new"
+    assert len(file_api.requests) == 1
+    assert client.find_document_by_title("Oldest") == "tok_old"
+    assert client.find_document_by_title("Missing") is None
+    assert client.find_document_by_title("Missing") is None
+    assert len(file_api.requests) == 2
+
+
+def test_markdown_to_blocks_is_cached_and_read_only():
+    markdown = "## Cached\n- bullet"
+    first = _markdown_to_blocks(markdown)
+    assert _markdown_to_blocks(markdown) is first
+    with pytest.raises(TypeError):
+        first[0]["text"] = "changed"  # type: ignore[index]
+
+
+def test_prepend_to_document_relooks_up_a_stale_cached_token(tmp_path, monkeypatch):
+    cache_path = tmp_path / "lark_docs.json"
+    cache_path.write_text(json.dumps({"fld": {"Daily 2026-01": "doc_gone"}}), encoding="utf-8")
+    prepended = []
+
+    def fake_prepend(self, token, markdown):  # noqa: ANN001
+        prepended.append(token)
+        if token == "doc_gone":
+            raise RuntimeError("Lark API prepend blocks failed: document not found")
+
+    monkeypatch.setattr(LarkClient, "prepend_content", fake_prepend)
+    monkeypatch.setattr(LarkClient, "find_document_by_title", lambda self, title: None)
+    monkeypatch.setattr(LarkClient, "create_document", lambda self, title: "doc_new")
+    client = LarkClient("cli_x", "secret", "fld", cache_path=cache_path)
+    assert client.prepend_to_document("Daily 2026-01", "- entry") == "doc_new"
+    assert prepended == ["doc_gone", "doc_new"]
+    assert json.loads(cache_path.read_text(encoding="utf-8")) == {"fld": {"Daily 2026-01": "doc_new"}}
+
+
+def test_prepend_to_document_does_not_retry_a_fresh_lookup(monkeypatch):
+    calls = []
+
+    def failing_prepend(self, token, markdown):  # noqa: ANN001
+        calls.append(token)
+        raise RuntimeError("Lark API prepend blocks failed")
+
+    monkeypatch.setattr(LarkClient, "prepend_content", failing_prepend)
+    monkeypatch.setattr(LarkClient, "find_document_by_title", lambda self, title: "doc_found")
+    client = LarkClient("cli_x", "secret", "fld")
+    with pytest.raises(RuntimeError):
+        client.prepend_to_document("Daily 2026-01", "- entry")
+    assert calls == ["doc_found"]
+
+
+def test_ensure_document_treats_malformed_folder_cache_as_miss(tmp_path, monkeypatch):
+    cache_path = tmp_path / "lark_docs.json"
+    cache_path.write_text(json.dumps({"fld": ["not", "a", "dict"]}), encoding="utf-8")
+    monkeypatch.setattr(LarkClient, "find_document_by_title", lambda self, title: "doc_found")
+    client = LarkClient("cli_x", "secret", "fld", cache_path=cache_path)
+    assert client.ensure_document("Daily 2026-01") == "doc_found"
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import pytest
+
+import llm_cache
+from llm_cache import chat_cached, clear_cache
+
+
+class _FakeLLMClient:
+    def __init__(self, replies, cache_dir=None):  # noqa: ANN001
+        self.model = "test-model"
+        self.cache_dir = cache_dir
+        self._replies = list(replies)
+        self.calls = []
+
+    def chat(self, system_prompt, user_prompt, response_format="json_object"):  # noqa: ANN001
+        self.calls.append((system_prompt, user_prompt, response_format))
+        return self._replies.pop(0)
+
+
+@pytest.fixture(autouse=True)
+def _empty_memory_cache():
+    clear_cache(None)
+    yield
+    clear_cache(None)
+
+
+def test_chat_cached_reuses_disk_cache_across_processes(tmp_path):
+    first = _FakeLLMClient(['{"a": 1}'], cache_dir=tmp_path)
+    assert chat_cached(first, "sys", "user") == '{"a": 1}'
+    clear_cache(None)  # simulate a new process: memory is empty, disk remains
+
+    second = _FakeLLMClient([], cache_dir=tmp_path)
+    assert chat_cached(second, "sys", "user") == '{"a": 1}'
+    assert second.calls == []
+
+
+def test_chat_cached_keys_on_prompts_model_and_format():
+    client = _FakeLLMClient(['{"a": 1}', '{"b": 2}', "plain"])
+    chat_cached(client, "sys", "user")
+    chat_cached(client, "sys", "user")
+    assert chat_cached(client, "sys", "other") == '{"b": 2}'
+    assert chat_cached(client, "sys", "user", response_format=None) == "plain"
+    assert len(client.calls) == 3
+
+
+def test_chat_cached_does_not_store_malformed_json(tmp_path):
+    client = _FakeLLMClient(["not json", '{"ok": true}'], cache_dir=tmp_path)
+    assert chat_cached(client, "sys", "user") == "not json"
+    assert chat_cached(client, "sys", "user") == '{"ok": true}'
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+def test_memory_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(llm_cache, "MAX_MEMORY_ENTRIES", 2)
+    client = _FakeLLMClient(['{"n": 1}', '{"n": 2}', '{"n": 3}', '{"n": 4}'])
+    for prompt in ("one", "two", "three"):
+        chat_cached(client, "sys", prompt)
+    assert chat_cached(client, "sys", "one") == '{"n": 4}'
+    assert len(llm_cache._memory) == 2
+
+
+def test_clear_cache_removes_directory(tmp_path):
+    cache_dir = tmp_path / "llm"
+    chat_cached(_FakeLLMClient(['{"a": 1}'], cache_dir=cache_dir), "sys", "user")
+    assert cache_dir.exists()
+    clear_cache(cache_dir)
+    assert not cache_dir.exists()
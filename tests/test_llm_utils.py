@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import pytest
+import requests
+
+import json_utils
+from llm_utils import LLMClient, _parse_json_response, generate_english_learning
+
+
+class _FakeResponse:
+    status_code = 200
+    content = b'{"choices": [{"message": {"content": "{\\"ok\\": true}"}}]}'
+
+
+class _FakeSession:
+    def __init__(self):
+        self.headers = requests.structures.CaseInsensitiveDict()
+        self.calls = []
+
+    def post(self, url, json=None, headers=None, timeout=None):  # noqa: ANN001
+        self.calls.append({"url": url, "json": json, "headers": dict(headers or {})})
+        return _FakeResponse()
+
+
+def test_chat_posts_through_client_session():
+    session = _FakeSession()
+    client = LLMClient(api_key="k1", base_url="https://llm.example/v1/", session=session)
+    assert client.chat("sys", "user") == '{"ok": true}'
+    client.api_key = "k2"
+    client.chat("sys", "user", response_format=None)
+
+    assert [call["url"] for call in session.calls] == ["https://llm.example/v1/chat/completions"] * 2
+    assert session.calls[0]["headers"]["Authorization"] == "Bearer k1"
+    assert session.calls[1]["headers"]["Authorization"] == "Bearer k2"
+    # The session may be shared with feed clients, so it never carries the key.
+    assert "Authorization" not in session.headers
+    assert session.calls[0]["json"]["response_format"] == {"type": "json_object"}
+    assert "response_format" not in session.calls[1]["json"]
+
+
+def test_reassigning_base_url_moves_chat_endpoint():
+    session = _FakeSession()
+    client = LLMClient(api_key="k", base_url="https://old.example/v1", session=session)
+    client.base_url = "https://new.example/v1/"
+    client.chat("sys", "user")
+    assert client.base_url == "https://new.example/v1"
+    assert session.calls[0]["url"] == "https://new.example/v1/chat/completions"
+
+
+def test_default_session_retries_posts():
+    client = LLMClient(api_key="k")
+    retry = client._session.get_adapter("https://api.openai.com").max_retries
+    assert "POST" in retry.allowed_methods
+    assert set(retry.status_forcelist) == {429, 503}
+    # A POST whose response timed out may have been billed; it is never resent.
+    assert retry.read == 0
+    assert retry.total == 3
+
+
+def test_parse_json_response_accepts_unicode_and_rejects_garbage():
+    assert _parse_json_response('{"word": "\u65e5\u672c"}') == {"word": "日本"}
+    with pytest.raises(json_utils.JSONDecodeError):
+        _parse_json_response("not json")
+
+
+def test_generate_english_learning_embeds_news_text_verbatim(monkeypatch):
+    prompts = []
+
+    def fake_chat_cached(client, system_prompt, user_prompt, response_format="json_object"):  # noqa: ANN001
+        prompts.append(user_prompt)
+        return '{"summary_en": "s", "summary_zh": "z"}'
+
+    monkeypatch.setattr("llm_utils.chat_cached", fake_chat_cached)
+    assert generate_english_learning(None, "Set {x} = 1") == {"summary_en": "s", "summary_zh": "z"}
+    assert 'News:\n"""Set {x} = 1"""\n\nRequirements:' in prompts[0]
+    assert prompts[0].rstrip().endswith('"summary_zh": "..."\n}')
@@ -1,6 +1,10 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from io import BytesIO
+from types import SimpleNamespace
+
+import pytest
 
 from netflix_client import NetflixTechBlogRSSClient
 
@@ -9,18 +13,33 @@ from netflix_client import NetflixTechBlogRSSClient
 class _FakeResponse:
     content: bytes
 
+    def __post_init__(self) -> None:
+        self.raw = BytesIO(self.content)
+        self.closed = False
+
+    def __enter__(self):  # noqa: ANN204
+        return self
+
+    def __exit__(self, *exc_info) -> None:  # noqa: ANN002
+        self.closed = True
+
     def raise_for_status(self) -> None:
         return
 
+    def iter_content(self, chunk_size: int = 1):
+        while chunk := self.raw.read(chunk_size):
+            yield chunk
+
 
 class _FakeSession:
     def __init__(self, content: bytes):
         self._content = content
         self.calls = []
 
-    def get(self, url: str, timeout: int = 10, verify=True):  # noqa: ANN001
-        self.calls.append({"url": url, "timeout": timeout, "verify": verify})
-        return _FakeResponse(content=self._content)
+    def get(self, url: str, timeout: int = 10, verify=True, stream=False):  # noqa: ANN001
+        self.calls.append({"url": url, "timeout": timeout, "verify": verify, "stream": stream})
+        self.last_response = _FakeResponse(content=self._content)
+        return self.last_response
 
 
 def test_netflix_rss_prefers_content_encoded_and_strips_html():
@@ -77,6 +96,43 @@ def test_netflix_rss_truncates_when_max_chars_set():
     assert items[0].content.endswith("...(truncated)")
 
 
+def test_netflix_rss_parses_only_head_of_long_articles(monkeypatch):
+    body = "<p>" + "word " * 500 + "</p>"
+    rss = f"""<?xml version='1.0' encoding='UTF-8'?>
+<rss version='2.0'>
+  <channel>
+    <item>
+      <title>Long Post</title>
+      <link>https://netflixtechblog.com/long</link>
+      <description><![CDATA[{body}]]></description>
+    </item>
+  </channel>
+</rss>
+""".encode("utf-8")
+    parsed = []
+    original = NetflixTechBlogRSSClient._html_to_text
+    monkeypatch.setattr(
+        NetflixTechBlogRSSClient,
+        "_html_to_text",
+        staticmethod(lambda html, max_chars=0: parsed.append(html) or original(html, max_chars)),
+    )
+    client = NetflixTechBlogRSSClient(session=_FakeSession(rss), max_chars=100)
+    items = client.fetch_latest(limit=1)
+    assert len(parsed[0]) == 400
+    assert items[0].content.startswith("word word")
+    assert items[0].content.endswith("...(truncated)")
+    assert len(items[0].content) <= 100 + len("\n\n...(truncated)")
+
+
+def test_netflix_rss_truncation_keeps_full_budget_without_trailing_space():
+    rss = b"""<rss version='2.0'><channel><item><title>T</title><link>https://x/t</link>
+<description><![CDATA[<p>alpha beta gamma</p>]]></description></item></channel></rss>"""
+    cut_mid_word = NetflixTechBlogRSSClient(session=_FakeSession(rss), max_chars=8)
+    assert cut_mid_word.fetch_latest()[0].content == "alpha be\n\n...(truncated)"
+    cut_at_space = NetflixTechBlogRSSClient(session=_FakeSession(rss), max_chars=6)
+    assert cut_at_space.fetch_latest()[0].content == "alpha\n\n...(truncated)"
+
+
 def test_netflix_rss_ssl_fallback_retries_with_verify_false():
     rss = b"""<?xml version='1.0' encoding='UTF-8'?>
 <rss version='2.0' xmlns:content='http://purl.org/rss/1.0/modules/content/'>
@@ -95,7 +151,7 @@ def test_netflix_rss_ssl_fallback_retries_with_verify_false():
             super().__init__(content)
             self._failed = False
 
-        def get(self, url: str, timeout: int = 10, verify=True):  # noqa: ANN001
+        def get(self, url: str, timeout: int = 10, verify=True, stream=False):  # noqa: ANN001
             from requests import exceptions as requests_exceptions
 
             self.calls.append({"url": url, "timeout": timeout, "verify": verify})
@@ -114,6 +170,41 @@ def test_netflix_rss_ssl_fallback_retries_with_verify_false():
     assert session.calls[1]["verify"] is False
 
 
+def test_netflix_rss_ssl_fallback_uses_system_trust_store(monkeypatch):
+    rss = b"""<?xml version='1.0' encoding='UTF-8'?>
+<rss version='2.0'>
+  <channel>
+    <item>
+      <title>Via System Trust</title>
+      <link>https://netflixtechblog.com/example</link>
+      <description><![CDATA[<p>Hello</p>]]></description>
+    </item>
+  </channel>
+</rss>
+"""
+
+    class _SSLFailSession(_FakeSession):
+        def get(self, url: str, timeout: int = 10, verify=True, stream=False):  # noqa: ANN001
+            from requests import exceptions as requests_exceptions
+
+            raise requests_exceptions.SSLError("bad cert")
+
+    class _FakePool:
+        def __init__(self):
+            self.urls = []
+
+        def request(self, method: str, url: str, timeout=None):  # noqa: ANN001, ANN201
+            self.urls.append((method, url))
+            return SimpleNamespace(status=200, data=rss)
+
+    pool = _FakePool()
+    client = NetflixTechBlogRSSClient(session=_SSLFailSession(b""), allow_curl_fallback=True)
+    monkeypatch.setattr("netflix_client.get_system_trust_pool", lambda: pool)
+    items = client.fetch_latest(limit=1)
+    assert [item.title for item in items] == ["Via System Trust"]
+    assert pool.urls == [("GET", "https://netflixtechblog.com/feed")]
+
+
 def test_netflix_rss_tries_fallback_urls_when_primary_fails_ssl():
     rss_ok = b"""<?xml version='1.0' encoding='UTF-8'?>
 <rss version='2.0' xmlns:content='http://purl.org/rss/1.0/modules/content/'>
@@ -128,7 +219,7 @@ def test_netflix_rss_tries_fallback_urls_when_primary_fails_ssl():
 """
 
     class _FailPrimarySession(_FakeSession):
-        def get(self, url: str, timeout: int = 10, verify=True):  # noqa: ANN001
+        def get(self, url: str, timeout: int = 10, verify=True, stream=False):  # noqa: ANN001
             from requests import exceptions as requests_exceptions
 
             self.calls.append({"url": url, "timeout": timeout, "verify": verify})
@@ -149,3 +240,213 @@ def test_netflix_rss_tries_fallback_urls_when_primary_fails_ssl():
     assert items[0].title == "From Fallback"
     assert session.calls[0]["url"] == "https://netflixtechblog.com/feed"
     assert session.calls[1]["url"] == "https://medium.com/feed/netflix-techblog"
+
+
+def test_netflix_rss_stops_after_limit_and_skips_incomplete_items():
+    rss = b"""<?xml version='1.0' encoding='UTF-8'?>
+<rss version='2.0' xmlns:content='http://purl.org/rss/1.0/modules/content/'>
+  <channel>
+    <item>
+      <title>No Link</title>
+      <content:encoded><![CDATA[<p>skipped</p>]]></content:encoded>
+    </item>
+    <item>
+      <title>First</title>
+      <link>https://netflixtechblog.com/first</link>
+      <description><![CDATA[<p>Only a description</p>]]></description>
+    </item>
+    <item>
+      <title>Second</title>
+      <link>https://netflixtechblog.com/second</link>
+    </item>
+  </channel>
+</rss>
+"""
+    client = NetflixTechBlogRSSClient(session=_FakeSession(rss), max_chars=0)
+    items = client.fetch_latest(limit=1)
+    assert [item.title for item in items] == ["First"]
+    assert items[0].content == "Only a description"
+
+
+def test_html_to_text_decodes_entities_once():
+    html = "<p>Use &lt;b&gt; &amp;amp; &amp;lt;i&amp;gt;</p>"
+    assert NetflixTechBlogRSSClient._html_to_text(html) == "Use <b> &amp; &lt;i&gt;"
+
+
+def test_html_to_text_strips_lines_and_collapses_blank_runs():
+    html = "<p>  First  </p>\r\n\r\n\r\n<pre>  a\n\n\n\nb  </pre><p>Last</p>"
+    assert NetflixTechBlogRSSClient._html_to_text(html) == "First\n\na\n\nb\n\nLast"
+
+
+def test_html_to_text_keeps_repeated_lines():
+    html = "<li>Same</li><li>Same</li><p>Same</p>"
+    assert NetflixTechBlogRSSClient._html_to_text(html) == "- Same\n\n- Same\n\nSame"
+
+
+def test_html_to_text_keeps_spaces_around_inline_tags():
+    html = "<p>Use <b>bold</b> <i>and</i>\n  <code>code</code>  here</p><li> spaced </li>"
+    assert NetflixTechBlogRSSClient._html_to_text(html) == "Use bold and code here\n\n- spaced"
+
+
+def test_html_to_text_plain_snippet_skips_parser(monkeypatch):
+    monkeypatch.setattr("netflix_client._HTMLToText", None)
+    assert NetflixTechBlogRSSClient._html_to_text("  A plain\n  snippet.  ") == "A plain snippet."
+
+
+def test_html_to_text_inline_snippet_skips_parser(monkeypatch):
+    monkeypatch.setattr("netflix_client._HTMLToText", None)
+    html = "<p>Read <a href='https://x/a?b=1&amp;c=2'>our &amp; <em>their</em></a>  notes.</p>"
+    assert NetflixTechBlogRSSClient._html_to_text(html) == "Read our & their notes."
+
+
+def test_html_to_text_structural_snippet_uses_parser():
+    html = "<p>One</p><p>Two <b>bold</b></p><script>x()</script>"
+    assert NetflixTechBlogRSSClient._html_to_text(html) == "One\n\nTwo bold"
+
+
+def test_netflix_rss_detaches_items_after_reading(monkeypatch):
+    import netflix_client
+
+    rss = b"""<rss version='2.0'><channel><title>Feed</title>
+<item><title>A</title><link>https://x/a</link><description>a</description></item>
+<item><title>B</title><link>https://x/b</link><description>b</description></item>
+</channel></rss>"""
+    channels = []
+
+    class RecordingPullParser(netflix_client.ET.XMLPullParser):
+        def read_events(self):  # noqa: ANN202
+            for event, elem in super().read_events():
+                if elem.tag == "channel":
+                    channels.append(elem)
+                yield event, elem
+
+    monkeypatch.setattr(netflix_client.ET, "XMLPullParser", RecordingPullParser)
+    client = NetflixTechBlogRSSClient(session=_FakeSession(rss))
+    assert [item.title for item in client.fetch_latest(limit=5)] == ["A", "B"]
+    assert [child.tag for child in channels[0]] == ["title"]
+
+
+def test_html_to_text_drops_script_and_style_contents():
+    html = (
+        "<style>p { color: red; }</style><p>Visible</p>"
+        "<script>var x = '<p>not text</p>';</script><noscript>Enable JS</noscript><p>After</p>"
+    )
+    assert NetflixTechBlogRSSClient._html_to_text(html) == "Visible\n\nAfter"
+
+
+def test_html_to_text_reused_parser_starts_clean():
+    assert NetflixTechBlogRSSClient._html_to_text("<pre>cut <b") == "cut"
+    assert NetflixTechBlogRSSClient._html_to_text("<p>next   article</p>") == "next article"
+
+
+def test_netflix_rss_builds_one_html_parser_for_all_items(monkeypatch):
+    import threading
+
+    import netflix_client
+
+    built = []
+
+    class CountingParser(netflix_client._HTMLToText):
+        def __init__(self) -> None:
+            built.append(self)
+            super().__init__()
+
+    monkeypatch.setattr(netflix_client, "_HTMLToText", CountingParser)
+    monkeypatch.setattr(netflix_client, "_parser_local", threading.local())
+    netflix_client._html_to_text_cached.cache_clear()
+    item = (
+        "<item><title>T{0}</title><link>https://x/{0}</link>"
+        "<description><![CDATA[<h2>Part {0}</h2><p>Body {0}</p>]]></description></item>"
+    )
+    rss = ("<rss version='2.0'><channel>" + "".join(item.format(i) for i in range(3))).encode()
+    rss += b"</channel></rss>"
+    items = NetflixTechBlogRSSClient(session=_FakeSession(rss)).fetch_latest(limit=3)
+    assert [entry.content for entry in items] == [f"Part {i}\nBody {i}" for i in range(3)]
+    assert len(built) == 1
+
+
+def test_html_to_text_stops_parsing_past_text_budget():
+    html = "".join(f"<p>para {i}</p>" for i in range(1000))
+    text = NetflixTechBlogRSSClient._html_to_text(html, max_chars=20)
+    assert text.startswith("para 0\n\npara 1")
+    assert 20 < len(text) < 60
+    assert NetflixTechBlogRSSClient._html_to_text("<p>after</p>") == "after"
+
+
+def test_whitespace_collapse_matches_str_split_semantics():
+    import re
+
+    from netflix_client import _collapse_whitespace
+
+    samples = ["a \t b", "x\xa0\xa0y", "日本\u3000語", " lead", "trail\r\n", "\x0b\x0c", "none"]
+    for sample in samples:
+        assert _collapse_whitespace(sample) == re.sub(r"\s+", " ", sample)
+    html = "<p>One&nbsp;&nbsp;two\u3000three</p>"
+    assert NetflixTechBlogRSSClient._html_to_text(html) == "One two three"
+
+
+def test_netflix_rss_streams_body_and_stops_reading_at_limit():
+    import netflix_client
+
+    item = "<item><title>T{0}</title><link>https://x/{0}</link><description>d</description></item>"
+    rss = ("<rss version='2.0'><channel>" + "".join(item.format(i) for i in range(2000))).encode()
+    rss += b"</channel></rss>"
+    session = _FakeSession(rss)
+    items = NetflixTechBlogRSSClient(session=session).fetch_latest(limit=1)
+    assert [entry.title for entry in items] == ["T0"]
+    assert session.calls[0]["stream"] is True
+    assert session.last_response.closed
+    assert session.last_response.raw.tell() == netflix_client.FEED_CHUNK_SIZE
+
+
+def test_html_to_text_memoizes_per_html_and_budget(monkeypatch):
+    import netflix_client
+
+    netflix_client._html_to_text_cached.cache_clear()
+    feeds = []
+    original_feed = netflix_client._HTMLToText.feed
+    monkeypatch.setattr(
+        netflix_client._HTMLToText,
+        "feed",
+        lambda self, data: feeds.append(data) or original_feed(self, data),
+    )
+    html = "<h2>Repeated</h2><p>article</p>"
+    assert NetflixTechBlogRSSClient._html_to_text(html, 100) == "Repeated\narticle"
+    assert NetflixTechBlogRSSClient._html_to_text(html, 100) == "Repeated\narticle"
+    assert len(feeds) == 1
+    NetflixTechBlogRSSClient._html_to_text(html, 50)
+    assert len(feeds) == 2
+
+
+def test_netflix_rss_skips_field_parsing_for_incomplete_items(monkeypatch):
+    rss = b"""<rss version='2.0'><channel><title>Feed</title>
+<item><link>https://x/untitled</link><pubDate>Mon, 05 Jan 2026 00:00:00 +0000</pubDate></item>
+<item><title>B</title><link>https://x/b</link><pubDate>Tue, 06 Jan 2026 00:00:00 +0000</pubDate>
+<description>b</description></item>
+</channel></rss>"""
+    parsed = []
+    client = NetflixTechBlogRSSClient(session=_FakeSession(rss))
+    original = client._parse_datetime
+    monkeypatch.setattr(
+        client, "_parse_datetime", lambda value, *args: parsed.append(value) or original(value, *args)
+    )
+    assert [item.title for item in client.fetch_latest(limit=5)] == ["B"]
+    assert parsed == ["Tue, 06 Jan 2026 00:00:00 +0000"]
+
+
+def test_netflix_rss_rejects_items_outside_channel():
+    rss = b"<rss version='2.0'><item><title>A</title><link>https://x/a</link></item></rss>"
+    client = NetflixTechBlogRSSClient(session=_FakeSession(rss))
+    with pytest.raises(ValueError):
+        client._parse_items(rss, limit=1)
+    with pytest.raises(ValueError):
+        client._parse_items(b"<rss version='2.0'><title>x</title></rss>", limit=1)
+
+
+def test_netflix_rss_reads_only_direct_channel_items():
+    rss = b"""<rss version='2.0'><channel><title>Feed</title>
+<extra><item><title>Nested</title><link>https://x/n</link></item></extra>
+<item><title>A</title><link>https://x/a</link><description>a</description></item>
+</channel><channel><item><title>B</title><link>https://x/b</link></item></channel></rss>"""
+    client = NetflixTechBlogRSSClient(session=_FakeSession(rss))
+    assert [item.title for item in client._parse_items(rss, limit=5)] == ["A"]
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import pytest
+
+from rss_client import JapaneseRSSClient
+
+
+@dataclass
+class _FakeResponse:
+    content: bytes
+
+    def raise_for_status(self) -> None:
+        return
+
+
+class _FakeSession:
+    def __init__(self, content: bytes):
+        self._content = content
+
+    def get(self, url: str, timeout: int = 10):  # noqa: ANN201
+        return _FakeResponse(content=self._content)
+
+
+def _rss(*items: str) -> bytes:
+    return (
+        "<?xml version='1.0' encoding='UTF-8'?><rss version='2.0'><channel>"
+        + "".join(items)
+        + "</channel></rss>"
+    ).encode("utf-8")
+
+
+def _item(title: str, description: str = "本文です。") -> str:
+    return (
+        f"<item><title>{title}</title><link>https://www3.nhk.or.jp/{title}</link>"
+        f"<description>{description}</description>"
+        "<pubDate>Mon, 05 Jan 2026 09:00:00 +0900</pubDate></item>"
+    )
+
+
+def test_fetch_items_skips_incomplete_items_and_respects_limit():
+    rss = _rss(_item("一"), _item("空", description=""), _item("二"), _item("三"))
+    client = JapaneseRSSClient("https://example.jp/rss", session=_FakeSession(rss))
+    items = client.fetch_items(limit=2)
+    assert [item.title for item in items] == ["一", "二"]
+    assert items[0].link == "https://www3.nhk.or.jp/一"
+    assert items[0].published_at.utcoffset().total_seconds() == 9 * 3600
+
+
+def test_fetch_items_stops_parsing_at_limit():
+    rss = ("<rss version='2.0'><channel>" + _item("一") + "<item><title>cut off").encode("utf-8")
+    client = JapaneseRSSClient("https://example.jp/rss", session=_FakeSession(rss))
+    assert [item.title for item in client.fetch_items(limit=1)] == ["一"]
+
+
+def test_fetch_items_requires_channel():
+    client = JapaneseRSSClient("https://example.jp/rss", session=_FakeSession(b"<rss/>"))
+    with pytest.raises(ValueError):
+        client.fetch_items()
+
+
+def test_fetch_items_rejects_items_outside_channel_even_when_stopping_early():
+    rss = ("<rss version='2.0'>" + _item("一") + _item("二") + "</rss>").encode("utf-8")
+    client = JapaneseRSSClient("https://example.jp/rss", session=_FakeSession(rss))
+    with pytest.raises(ValueError):
+        client.fetch_items(limit=1)
+
+
+def test_fetch_items_honours_declared_non_utf8_encoding():
+    rss = (
+        "<?xml version='1.0' encoding='Shift_JIS'?><rss version='2.0'><channel>"
+        + _item("速報", description="東京で雪が降りました。")
+        + "</channel></rss>"
+    ).encode("shift_jis")
+    client = JapaneseRSSClient("https://example.jp/rss", session=_FakeSession(rss))
+    [item] = client.fetch_items()
+    assert item.title == "速報"
+    assert item.content == "東京で雪が降りました。"
+
+
+def test_items_without_pubdate_share_one_fallback_timestamp():
+    undated = "<item><title>{0}</title><link>https://x/{0}</link><description>本文</description></item>"
+    rss = _rss(undated.format("A"), undated.format("B"))
+    client = JapaneseRSSClient("https://example.jp/rss", session=_FakeSession(rss))
+    first, second = client.fetch_items(limit=2)
+    assert first.published_at is second.published_at